@@ -0,0 +1,39 @@
+"""add bill text manifest
+
+Revision ID: 125b0dae006e
+Revises: 50761b0af5ec
+Create Date: 2025-06-13 08:41:09.362551
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "125b0dae006e"
+down_revision: Union[str, None] = "50761b0af5ec"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bill_text_manifest",
+        sa.Column("hash", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="processed"),
+        sa.Column("parser_version", sa.Integer(), nullable=False),
+        sa.Column("pdf_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("json_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("txt_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("processed_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+    op.create_index("ix_bill_text_manifest_status", "bill_text_manifest", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bill_text_manifest_status", table_name="bill_text_manifest")
+    op.drop_table("bill_text_manifest")
@@ -0,0 +1,35 @@
+"""add reference data generation
+
+Revision ID: 20feaf32ba43
+Revises: bc59b89a994f
+Create Date: 2025-06-19 15:22:36.804417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20feaf32ba43"
+down_revision: Union[str, None] = "bc59b89a994f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A single row, bumped whenever the reference tables change so API processes reload them
+    op.execute(
+        """
+        CREATE TABLE reference_data_generation (
+            id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+            generation BIGINT NOT NULL DEFAULT 0
+        )
+    """
+    )
+    op.execute("INSERT INTO reference_data_generation DEFAULT VALUES")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS reference_data_generation")
@@ -0,0 +1,33 @@
+"""add etl watermarks
+
+Revision ID: 3d270bca65c2
+Revises: 3adfde5f33f0
+Create Date: 2025-06-09 09:12:41.218305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d270bca65c2"
+down_revision: Union[str, None] = "3adfde5f33f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "etl_watermarks",
+        sa.Column("destination", sa.String(), nullable=False),
+        sa.Column("high_water_mark", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("destination"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("etl_watermarks")
@@ -0,0 +1,39 @@
+"""add bill text sources
+
+Revision ID: 50761b0af5ec
+Revises: 7f64408cf031
+Create Date: 2025-06-12 10:27:53.804112
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "50761b0af5ec"
+down_revision: Union[str, None] = "7f64408cf031"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bill_text_sources",
+        sa.Column("url_hash", sa.String(), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("etag", sa.String(), nullable=True),
+        sa.Column("last_modified", sa.String(), nullable=True),
+        sa.Column("content_hash", sa.String(), nullable=False),
+        sa.Column("checked_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("url_hash"),
+    )
+    op.create_index("ix_bill_text_sources_content_hash", "bill_text_sources", ["content_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bill_text_sources_content_hash", table_name="bill_text_sources")
+    op.drop_table("bill_text_sources")
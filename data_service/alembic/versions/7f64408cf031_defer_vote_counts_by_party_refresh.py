@@ -0,0 +1,141 @@
+"""defer vote_counts_by_party refresh
+
+Revision ID: 7f64408cf031
+Revises: 3d270bca65c2
+Create Date: 2025-06-11 14:03:27.518920
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7f64408cf031"
+down_revision: Union[str, None] = "3d270bca65c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS refresh_vote_counts_by_party_trigger ON legislator_votes;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_vote_counts_by_party();")
+
+    op.execute(
+        """
+        CREATE TABLE materialized_view_refreshes (
+            view_name VARCHAR PRIMARY KEY,
+            dirty BOOLEAN NOT NULL DEFAULT FALSE,
+            refreshed_at TIMESTAMP
+        )
+    """
+    )
+    op.execute(
+        """
+        INSERT INTO materialized_view_refreshes (view_name, dirty)
+        VALUES ('vote_counts_by_party', TRUE)
+    """
+    )
+
+    # Writes only flag the view; skip the UPDATE when it is already dirty so concurrent writers
+    # don't queue up on the flag row
+    op.execute(
+        """
+            CREATE OR REPLACE FUNCTION mark_materialized_view_dirty()
+            RETURNS trigger
+            LANGUAGE plpgsql
+            AS $$
+            BEGIN
+                UPDATE materialized_view_refreshes
+                SET dirty = TRUE
+                WHERE view_name = TG_ARGV[0] AND NOT dirty;
+                RETURN NULL;
+            END;
+            $$;
+        """
+    )
+
+    # Claims the flag and refreshes at most once per batch of writes. Holders of the exclusive
+    # advisory lock on the view name (e.g. the ETL pipeline) suspend refreshes until they release it
+    op.execute(
+        """
+            CREATE OR REPLACE FUNCTION refresh_materialized_view_if_dirty(target_view VARCHAR)
+            RETURNS BOOLEAN
+            LANGUAGE plpgsql
+            AS $$
+            BEGIN
+                IF NOT pg_try_advisory_xact_lock_shared(hashtext(target_view)) THEN
+                    RETURN FALSE;
+                END IF;
+
+                UPDATE materialized_view_refreshes
+                SET dirty = FALSE, refreshed_at = NOW()
+                WHERE view_name = target_view AND dirty;
+                IF NOT FOUND THEN
+                    RETURN FALSE;
+                END IF;
+
+                EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY %I', target_view);
+                RETURN TRUE;
+            END;
+            $$;
+        """
+    )
+
+    op.execute(
+        """
+            CREATE TRIGGER mark_vote_counts_by_party_dirty_trigger
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+                ON legislator_votes
+                FOR EACH STATEMENT
+                EXECUTE PROCEDURE mark_materialized_view_dirty('vote_counts_by_party');
+        """
+    )
+
+    # The view groups by party, so moving a legislator between parties also invalidates it
+    op.execute(
+        """
+            CREATE TRIGGER mark_vote_counts_by_party_dirty_on_party_trigger
+                AFTER UPDATE OF party_id OR DELETE
+                ON legislators
+                FOR EACH STATEMENT
+                EXECUTE PROCEDURE mark_materialized_view_dirty('vote_counts_by_party');
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS mark_vote_counts_by_party_dirty_on_party_trigger ON legislators;"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS mark_vote_counts_by_party_dirty_trigger ON legislator_votes;"
+    )
+    op.execute("DROP FUNCTION IF EXISTS refresh_materialized_view_if_dirty(VARCHAR);")
+    op.execute("DROP FUNCTION IF EXISTS mark_materialized_view_dirty();")
+    op.execute("DROP TABLE IF EXISTS materialized_view_refreshes;")
+
+    op.execute(
+        """
+            CREATE OR REPLACE FUNCTION refresh_vote_counts_by_party()
+            RETURNS trigger
+            LANGUAGE plpgsql
+            AS $$
+            BEGIN
+                REFRESH MATERIALIZED VIEW CONCURRENTLY vote_counts_by_party;
+                RETURN NULL;
+            END;
+            $$;
+        """
+    )
+    op.execute(
+        """
+            CREATE TRIGGER refresh_vote_counts_by_party_trigger
+                AFTER INSERT OR UPDATE OR DELETE
+                ON legislator_votes
+                FOR EACH STATEMENT
+                EXECUTE PROCEDURE refresh_vote_counts_by_party();
+        """
+    )
+    op.execute("REFRESH MATERIALIZED VIEW vote_counts_by_party;")
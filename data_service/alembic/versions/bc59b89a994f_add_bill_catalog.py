@@ -0,0 +1,123 @@
+"""add bill catalog
+
+Revision ID: bc59b89a994f
+Revises: cf21406a8dbc
+Create Date: 2025-06-18 09:41:05.226731
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "bc59b89a994f"
+down_revision: Union[str, None] = "cf21406a8dbc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables the catalog reads from, and the writes to each that change what it holds
+CATALOG_SOURCES = {
+    "bills": "INSERT OR UPDATE OR DELETE OR TRUNCATE",
+    "bill_sponsors": "INSERT OR UPDATE OR DELETE OR TRUNCATE",
+    "legislators": "UPDATE OF name OR DELETE",
+    "statuses": "UPDATE OF name OR DELETE",
+    "sessions": "UPDATE OF name OR DELETE",
+    "states": "UPDATE OF name OR DELETE",
+    "roles": "UPDATE OF name OR DELETE",
+    "legislative_bodys": "UPDATE OF role_id OR DELETE",
+}
+
+
+def upgrade() -> None:
+    # One row per bill holding exactly the fields of a DenormalizedBill, with its sponsors
+    # pre-aggregated, so the details endpoints read a single table instead of joining seven
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW bill_catalog AS
+            SELECT
+                b.id AS bill_id,
+                b.legiscan_id,
+                b.identifier,
+                b.title,
+                b.description,
+                b.current_version_id,
+                b.status_id,
+                st.name AS status,
+                b.status_date,
+                b.session_id,
+                se.name AS session_name,
+                b.legislature_id AS state_id,
+                s.name AS state_name,
+                b.legislative_body_id,
+                lb.role_id,
+                r.name AS legislative_body_role,
+                COALESCE(sp.sponsors, '[]'::jsonb) AS sponsors
+            FROM bills b
+            LEFT JOIN statuses st ON st.id = b.status_id
+            LEFT JOIN sessions se ON se.id = b.session_id
+            LEFT JOIN states s ON s.id = b.legislature_id
+            LEFT JOIN legislative_bodys lb ON lb.id = b.legislative_body_id
+            LEFT JOIN roles r ON r.id = lb.role_id
+            LEFT JOIN (
+                SELECT
+                    bs.bill_id,
+                    jsonb_agg(
+                        jsonb_build_object(
+                            'bill_id', bs.bill_id,
+                            'legislator_id', bs.legislator_id,
+                            'legislator_name', l.name,
+                            'rank', bs.rank,
+                            'type', bs.type
+                        )
+                        ORDER BY bs.rank, bs.legislator_id
+                    ) AS sponsors
+                FROM bill_sponsors bs
+                JOIN legislators l ON l.id = bs.legislator_id
+                GROUP BY bs.bill_id
+            ) sp ON sp.bill_id = b.id
+    """
+    )
+
+    # REFRESH ... CONCURRENTLY requires a unique index
+    op.execute("CREATE UNIQUE INDEX bill_catalog_bill_id_idx ON bill_catalog (bill_id)")
+    # Filter and sort columns, with bill_id as the tiebreak of keyset pagination
+    filter_columns = ["state_id", "status_id", "session_id", "role_id"]
+    for column in filter_columns + ["identifier", "title", "status_date"]:
+        op.execute(f"CREATE INDEX bill_catalog_{column}_idx ON bill_catalog ({column}, bill_id)")
+
+    # Matching the expressions the details endpoint searches with
+    op.execute(
+        "CREATE INDEX bill_catalog_identifier_search_idx ON bill_catalog "
+        "USING gin(to_tsvector('simple', identifier))"
+    )
+    op.execute(
+        "CREATE INDEX bill_catalog_title_search_idx ON bill_catalog "
+        "USING gin(to_tsvector('english', title))"
+    )
+
+    op.execute(
+        """
+        INSERT INTO materialized_view_refreshes (view_name, dirty)
+        VALUES ('bill_catalog', FALSE)
+    """
+    )
+
+    for table, events in CATALOG_SOURCES.items():
+        op.execute(
+            f"""
+                CREATE TRIGGER mark_bill_catalog_dirty_trigger
+                    AFTER {events}
+                    ON {table}
+                    FOR EACH STATEMENT
+                    EXECUTE PROCEDURE mark_materialized_view_dirty('bill_catalog');
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in CATALOG_SOURCES:
+        op.execute(f"DROP TRIGGER IF EXISTS mark_bill_catalog_dirty_trigger ON {table};")
+    op.execute("DELETE FROM materialized_view_refreshes WHERE view_name = 'bill_catalog'")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS bill_catalog")
@@ -0,0 +1,43 @@
+"""add bill text failures
+
+Revision ID: cf21406a8dbc
+Revises: 125b0dae006e
+Create Date: 2025-06-16 10:12:47.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "cf21406a8dbc"
+down_revision: Union[str, None] = "125b0dae006e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bill_text_failures",
+        sa.Column("hash", sa.String(), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("error_class", sa.String(), nullable=False),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("dead_letter", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("first_failed_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_failed_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+    op.create_index(
+        "ix_bill_text_failures_next_attempt_at", "bill_text_failures", ["next_attempt_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bill_text_failures_next_attempt_at", table_name="bill_text_failures")
+    op.drop_table("bill_text_failures")
@@ -7,3 +7,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with connection.get_async_sessionmaker()() as db:
+        yield db
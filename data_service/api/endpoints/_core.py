@@ -1,8 +1,9 @@
 import logging
 from functools import wraps
 from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from common.database.referendum import crud
@@ -12,7 +13,7 @@ from common.database.referendum.crud import (
     ObjectNotFoundException,
 )
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..schemas.interactions import ErrorResponse
 from ..security import validate_user_or_verify_system_token, verify_system_token
 
@@ -84,6 +85,17 @@ def handle_crud_exceptions(resource_name: str) -> Callable:
     return decorator
 
 
+def etag_response(
+    crud_model: crud.ReferenceCRUD, request: Request, response: Response
+) -> Optional[Response]:
+    """Tag a cached reference data response, or answer 304 if the client's copy is current"""
+    etag = crud_model.etag()
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+
 class EndpointGenerator(Generic[T, CreateSchema, UpdateSchema, ResponseSchema]):
     @classmethod
     def add_crud_routes(
@@ -95,8 +107,17 @@ class EndpointGenerator(Generic[T, CreateSchema, UpdateSchema, ResponseSchema]):
         response_schema: Type[ResponseSchema],
         resource_name: str,
         permissions: Optional[CRUDPermissions] = None,
+        async_reads: bool = False,
     ):
+        """Add create, read, update, bulk update and delete routes for the resource
+
+        With async_reads, the GET routes query through an AsyncSession instead of blocking the
+        event loop. The response schema's relationships must then be eager loaded by the CRUD's
+        read_async and read_all_async, since async sessions can't lazy load them.
+        """
         logger.info(f"Generating CRUD routes for resource: {resource_name}")
+        if async_reads and isinstance(crud_model, crud.ReferenceCRUD):
+            raise ValueError("Reference data is read from its in-process cache, not async")
         if not permissions:
             permissions = CRUDPermissions(
                 create=verify_system_token,
@@ -134,7 +155,7 @@ class EndpointGenerator(Generic[T, CreateSchema, UpdateSchema, ResponseSchema]):
             logger.info(f"Successfully created {resource_name} with ID: {created_item.id}")
             return created_item
 
-        @router.get(
+        read_item_route = router.get(
             "/{item_id}",
             response_model=response_schema,
             summary=f"Get {resource_name} information",
@@ -151,15 +172,39 @@ class EndpointGenerator(Generic[T, CreateSchema, UpdateSchema, ResponseSchema]):
                 500: {"model": ErrorResponse, "description": "Internal server error"},
             },
         )
-        @handle_crud_exceptions(resource_name)
-        async def read_item(
-            item_id: int,
-            db: Session = Depends(get_db),
-            _: Dict[str, Any] = Depends(permissions.read),
-        ):
-            item = crud_model.read(db=db, obj_id=item_id)
-            logger.info(f"Successfully retrieved {resource_name} with ID: {item_id}")
-            return item
+
+        if async_reads:
+
+            @read_item_route
+            @handle_crud_exceptions(resource_name)
+            async def read_item_async(
+                item_id: int,
+                db: AsyncSession = Depends(get_async_db),
+                _: Dict[str, Any] = Depends(permissions.read),
+            ):
+                item = await crud_model.read_async(db=db, obj_id=item_id)
+                logger.info(f"Successfully retrieved {resource_name} with ID: {item_id}")
+                return item
+
+        else:
+
+            @read_item_route
+            @handle_crud_exceptions(resource_name)
+            async def read_item(
+                item_id: int,
+                request: Request,
+                response: Response,
+                db: Session = Depends(get_db),
+                _: Dict[str, Any] = Depends(permissions.read),
+            ):
+                if isinstance(crud_model, crud.ReferenceCRUD):
+                    item = crud_model.read_cached(db=db, obj_id=item_id)
+                    if not_modified := etag_response(crud_model, request, response):
+                        return not_modified
+                else:
+                    item = crud_model.read(db=db, obj_id=item_id)
+                logger.info(f"Successfully retrieved {resource_name} with ID: {item_id}")
+                return item
 
         @router.put(
             "/",
@@ -245,7 +290,7 @@ class EndpointGenerator(Generic[T, CreateSchema, UpdateSchema, ResponseSchema]):
             logger.info(f"Successfully deleted {resource_name} with ID: {item_id}")
             return
 
-        @router.get(
+        read_items_route = router.get(
             "/",
             response_model=List[response_schema],
             summary=f"Get all {resource_name}s",
@@ -258,13 +303,38 @@ class EndpointGenerator(Generic[T, CreateSchema, UpdateSchema, ResponseSchema]):
                 500: {"model": ErrorResponse, "description": "Internal server error"},
             },
         )
-        @handle_crud_exceptions(resource_name)
-        async def read_items(
-            skip: int | None = None,
-            limit: int | None = None,
-            db: Session = Depends(get_db),
-            _: Dict[str, Any] = Depends(permissions.read_all),
-        ):
-            items = crud_model.read_all(db=db, skip=skip, limit=limit)
-            logger.info(f"Successfully retrieved {len(items)} {resource_name}s")
-            return items
+
+        if async_reads:
+
+            @read_items_route
+            @handle_crud_exceptions(resource_name)
+            async def read_items_async(
+                skip: int | None = None,
+                limit: int | None = None,
+                db: AsyncSession = Depends(get_async_db),
+                _: Dict[str, Any] = Depends(permissions.read_all),
+            ):
+                items = await crud_model.read_all_async(db=db, skip=skip, limit=limit)
+                logger.info(f"Successfully retrieved {len(items)} {resource_name}s")
+                return items
+
+        else:
+
+            @read_items_route
+            @handle_crud_exceptions(resource_name)
+            async def read_items(
+                request: Request,
+                response: Response,
+                skip: int | None = None,
+                limit: int | None = None,
+                db: Session = Depends(get_db),
+                _: Dict[str, Any] = Depends(permissions.read_all),
+            ):
+                if isinstance(crud_model, crud.ReferenceCRUD):
+                    items = crud_model.read_all_cached(db=db, skip=skip, limit=limit)
+                    if not_modified := etag_response(crud_model, request, response):
+                        return not_modified
+                else:
+                    items = crud_model.read_all(db=db, skip=skip, limit=limit)
+                logger.info(f"Successfully retrieved {len(items)} {resource_name}s")
+                return items
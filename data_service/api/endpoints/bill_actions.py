@@ -18,4 +18,6 @@ EndpointGenerator.add_crud_routes(
     update_schema=schemas.BillAction.Record,
     response_schema=schemas.BillAction.Full,
     resource_name="bill_action",
+    # Bill actions serialize no relationships, so nothing needs eager loading
+    async_reads=True,
 )
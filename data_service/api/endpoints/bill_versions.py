@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from common.chat.bill import BillChatSessionManager
 from common.chat.service import LLMService, OpenAIException
 from common.database.referendum import crud, schemas
-from common.aws.s3.client import S3Client
+from common.aws.s3.client import get_s3_client
 
 from ..database import get_db
 from ..schemas.interactions import (
@@ -35,6 +35,8 @@ EndpointGenerator.add_crud_routes(
     update_schema=schemas.BillVersion.Record,
     response_schema=schemas.BillVersion.Full,
     resource_name="bill_version",
+    # Bill versions serialize no relationships, so nothing needs eager loading
+    async_reads=True,
 )
 
 
@@ -57,9 +59,11 @@ async def get_bill_text(
 ) -> dict:
     bill_version = crud.bill_version.read(db=db, obj_id=bill_version_id)
 
-    s3_client = S3Client()
-    text = s3_client.download_file(
-        bucket=settings.BILL_TEXT_BUCKET_NAME, key=f"{bill_version.hash}.txt"
+    s3_client = get_s3_client()
+    text = (
+        await s3_client.download_file_async(
+            bucket=settings.BILL_TEXT_BUCKET_NAME, key=f"{bill_version.hash}.txt"
+        )
     ).decode("utf-8")
 
     return {"bill_version_id": bill_version_id, "hash": bill_version.hash, "text": text}
@@ -86,9 +90,11 @@ async def get_bill_briefing(
     if bill_version.briefing:
         briefing = bill_version.briefing
     else:
-        s3_client = S3Client()
-        bill_text = s3_client.download_file(
-            bucket=settings.BILL_TEXT_BUCKET_NAME, key=f"{bill_version.hash}.txt"
+        s3_client = get_s3_client()
+        bill_text = (
+            await s3_client.download_file_async(
+                bucket=settings.BILL_TEXT_BUCKET_NAME, key=f"{bill_version.hash}.txt"
+            )
         ).decode("utf-8")
 
         llm_service = LLMService(openai_api_key=settings.OPENAI_API_KEY)
@@ -133,9 +139,11 @@ async def initialize_chat(
     bill_version = crud.bill_version.read(db=db, obj_id=bill_version_id)
 
     # Get bill text
-    s3_client = S3Client()
-    text = s3_client.download_file(
-        bucket=settings.BILL_TEXT_BUCKET_NAME, key=f"{bill_version.hash}.txt"
+    s3_client = get_s3_client()
+    text = (
+        await s3_client.download_file_async(
+            bucket=settings.BILL_TEXT_BUCKET_NAME, key=f"{bill_version.hash}.txt"
+        )
     ).decode("utf-8")
 
     # Create new session
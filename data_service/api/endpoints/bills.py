@@ -4,11 +4,12 @@ from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload, load_only
 
-from common.database.referendum import crud, models, schemas, utils
+from common.database.referendum import crud, models, schemas, utils, views
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..schemas.interactions import (
     BillFilterOptions,
     BillPaginationRequestBody,
@@ -45,6 +46,7 @@ EndpointGenerator.add_crud_routes(
     update_schema=schemas.Bill.Record,
     response_schema=schemas.Bill.Full,
     resource_name="bill",
+    async_reads=True,
 )
 
 
@@ -64,7 +66,7 @@ EndpointGenerator.add_crud_routes(
 @handle_general_exceptions()
 async def get_all_bill_details(
     request_body: BillPaginationRequestBody,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: Dict[str, Any] = Depends(validate_user_or_verify_system_token),
 ):
     try:
@@ -77,101 +79,76 @@ async def get_all_bill_details(
             else:
                 request_body.filter_options = BillFilterOptions(legislature_id=[52])
 
-        clauses = []
+        # The catalog carries role_id directly, so no filter needs a join
+        column_filter = None
         if request_body.filter_options:
-            # We need this until we flatten out 'role_id' in the bills table
             filter_options = request_body.filter_options.model_dump(exclude_none=True)
-            role_id = filter_options.pop("role_id", None)
-
-            if role_id is not None:
-                role_filter = models.Bill.legislative_body.has(
-                    models.LegislativeBody.role_id.in_(role_id)
-                )
-                clauses.append(role_filter)
-
             if filter_options:
-                non_role_filter = utils.create_column_filter(
-                    model=models.Bill,
+                column_filter = utils.create_column_filter(
+                    model=models.BillCatalog,
                     filter_options=filter_options,
                 )
-                clauses.append(non_role_filter)
-
-        column_filter = and_(*clauses) if clauses else None
 
         order_by = []
+        sort_option = {}
         if request_body.order_by:
             sort_option = request_body.order_by.model_dump()
-            order_by = utils.create_sort_column_list(model=models.Bill, sort_option=sort_option)
+            order_by = utils.create_sort_column_list(
+                model=models.BillCatalog, sort_option=sort_option
+            )
 
-        order_by.append(models.Bill.id)
+        order_by.append(models.BillCatalog.bill_id)
 
         search_filter = None
         if request_body.search_query:
             id_filter = utils.create_search_filter(
                 search_query=request_body.search_query,
                 search_config=utils.SearchConfig.SIMPLE,
-                fields=[models.Bill.identifier],
+                fields=[models.BillCatalog.identifier],
                 prefix=True,
             )
             title_filter = utils.create_search_filter(
                 search_query=request_body.search_query,
                 search_config=utils.SearchConfig.ENGLISH,
-                fields=[models.Bill.title],
+                fields=[models.BillCatalog.title],
             )
             search_filter = or_(id_filter, title_filter)
 
-        bills = crud.bill.read_all_denormalized(
+        if request_body.cursor:
+            keyset_filter = utils.create_keyset_filter(
+                model=models.BillCatalog, sort_option=sort_option, cursor=request_body.cursor
+            )
+            column_filter = (
+                keyset_filter if column_filter is None else and_(column_filter, keyset_filter)
+            )
+
+        # Normally just a flag check, since the API refreshes dirty views in the background
+        await views.refresh_view_if_dirty_async(db, views.MaterializedView.BILL_CATALOG)
+        bills = await crud.bill.read_catalog_async(
             db=db,
-            skip=request_body.skip,
+            skip=None if request_body.cursor else request_body.skip,
             limit=request_body.limit + 1,
             column_filter=column_filter,
             search_filter=search_filter,
             order_by=order_by,
         )
+        next_cursor = None
         if len(bills) > request_body.limit:
             has_more = True
             bills.pop()
+            next_cursor = utils.encode_cursor(bills[-1], sort_option) if bills else None
         else:
             has_more = False
 
-        result = []
-        for bill in bills:
-            sponsors = [
-                {
-                    "bill_id": sponsor.bill_id,
-                    "legislator_id": sponsor.legislator_id,
-                    "legislator_name": sponsor.legislator.name,
-                    "rank": sponsor.rank,
-                    "type": sponsor.type,
-                }
-                for sponsor in bill.sponsors
-            ]
-            bill_dict = {
-                "bill_id": bill.id,
-                "legiscan_id": bill.legiscan_id,
-                "identifier": bill.identifier,
-                "title": bill.title,
-                "description": bill.description,
-                "status_id": bill.status.id,
-                "status": bill.status.name,
-                "status_date": bill.status_date,
-                "session_id": bill.session.id,
-                "session_name": bill.session.name,
-                "state_id": bill.legislature.id,
-                "state_name": bill.legislature.name,
-                "current_version_id": bill.current_version_id,
-                "legislative_body_id": bill.legislative_body.id,
-                "role_id": bill.legislative_body.role.id,
-                "legislative_body_role": bill.legislative_body.role.name,
-                "sponsors": sponsors,
-            }
-            result.append(bill_dict)
-        return {"has_more": has_more, "items": result}
+        result = [DenormalizedBill.model_validate(bill) for bill in bills]
+        return {"has_more": has_more, "items": result, "next_cursor": next_cursor}
     except AttributeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid filter option: {e}",
         )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get(
@@ -190,40 +167,12 @@ async def get_all_bill_details(
 @handle_crud_exceptions("bill")
 async def get_bill_detail(
     bill_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: Dict[str, Any] = Depends(validate_user_or_verify_system_token),
 ):
-    bill = crud.bill.read_denormalized(db=db, bill_id=bill_id)
-    sponsors = [
-        {
-            "bill_id": sponsor.bill_id,
-            "legislator_id": sponsor.legislator_id,
-            "legislator_name": sponsor.legislator.name,
-            "rank": sponsor.rank,
-            "type": sponsor.type,
-        }
-        for sponsor in bill.sponsors
-    ]
-
-    return {
-        "bill_id": bill.id,
-        "legiscan_id": bill.legiscan_id,
-        "identifier": bill.identifier,
-        "title": bill.title,
-        "description": bill.description,
-        "status_id": bill.status.id,
-        "status": bill.status.name,
-        "status_date": bill.status_date,
-        "session_id": bill.session.id,
-        "session_name": bill.session.name,
-        "state_id": bill.legislature.id,
-        "state_name": bill.legislature.name,
-        "current_version_id": bill.current_version_id,
-        "legislative_body_id": bill.legislative_body.id,
-        "role_id": bill.legislative_body.role.id,
-        "legislative_body_role": bill.legislative_body.role.name,
-        "sponsors": sponsors,
-    }
+    await views.refresh_view_if_dirty_async(db, views.MaterializedView.BILL_CATALOG)
+    bill = await crud.bill.read_catalog_entry_async(db=db, bill_id=bill_id)
+    return DenormalizedBill.model_validate(bill)
 
 
 @router.get(
@@ -338,7 +287,7 @@ async def get_bill_comments(
 @handle_general_exceptions()
 async def get_bill_voting_history(
     bill_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: Dict[str, Any] = Depends(validate_user_or_verify_system_token),
 ) -> BillVotingHistory:
     query = (
@@ -352,7 +301,7 @@ async def get_bill_voting_history(
         .filter(models.LegislatorVote.bill_id == bill_id)
     )
 
-    results = db.execute(query).scalars().all()
+    results = (await db.execute(query)).scalars().all()
 
     all_legislator_votes = {}
     vote_summaries_by_action = defaultdict(
@@ -388,7 +337,7 @@ async def get_bill_voting_history(
         .order_by(models.BillAction.id.desc(), models.BillAction.date.desc())
     )
 
-    bill_action_results = db.execute(bill_action_query).scalars().all()
+    bill_action_results = (await db.execute(bill_action_query)).scalars().all()
 
     legislator_vote_detail = []
     for bill_action in bill_action_results:
@@ -4,7 +4,7 @@ from sqlalchemy import text
 from typing import Dict
 import os
 
-from common.aws.s3.client import S3Client
+from common.aws.s3.client import get_s3_client
 
 from ..database import get_db
 from ..schemas.interactions import ErrorResponse, HealthResponse
@@ -37,8 +37,8 @@ async def healthcheck(
 
     # Check S3 access
     try:
-        s3_client = S3Client()
-        s3_client.check_connection(BILL_TEXT_BUCKET_NAME)
+        s3_client = get_s3_client()
+        await s3_client.run_async(s3_client.check_connection, BILL_TEXT_BUCKET_NAME)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -2,10 +2,10 @@ import logging
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select, text
+from sqlalchemy import and_, or_, select, text
 from sqlalchemy.orm import Session, joinedload, load_only
 
-from common.database.referendum import crud, models, schemas, utils
+from common.database.referendum import crud, models, schemas, utils, views
 
 from ..constants import ABSENT_VOTE_ID, NAY_VOTE_ID, YEA_VOTE_ID
 from ..database import get_db
@@ -75,6 +75,7 @@ async def get_legislators(
             )
 
         order_by = []
+        sort_option = {}
         if request_body.order_by:
             sort_option = request_body.order_by.model_dump()
             order_by = utils.create_sort_column_list(
@@ -100,26 +101,38 @@ async def get_legislators(
             )
             search_filter = or_(name_filter, state_filter)
 
+        if request_body.cursor:
+            keyset_filter = utils.create_keyset_filter(
+                model=models.Legislator, sort_option=sort_option, cursor=request_body.cursor
+            )
+            column_filter = (
+                keyset_filter if column_filter is None else and_(column_filter, keyset_filter)
+            )
+
         legislators = crud.legislator.read_all(
             db=db,
-            skip=request_body.skip,
+            skip=None if request_body.cursor else request_body.skip,
             limit=request_body.limit + 1,
             column_filter=column_filter,
             search_filter=search_filter,
             order_by=order_by,
         )
+        next_cursor = None
         if len(legislators) > request_body.limit:
             has_more = True
             legislators.pop()
+            next_cursor = utils.encode_cursor(legislators[-1], sort_option) if legislators else None
         else:
             has_more = False
 
-        return {"has_more": has_more, "items": legislators}
+        return {"has_more": has_more, "items": legislators, "next_cursor": next_cursor}
     except AttributeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid filter option: {e}",
         )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get(
@@ -210,6 +223,8 @@ async def get_legislator_scorecard(
     # TODO - cache this and/or the subquery
     # TODO - Calculate success score (% of votes that go the way this legislator voted)
     # TODO - Calculate virtue signaling score (% of bills introduced by this legislator that go nowhere that go the way
+    # Normally just a flag check, since the API refreshes dirty views in the background
+    views.refresh_view_if_dirty(db, views.MaterializedView.VOTE_COUNTS_BY_PARTY)
     r = db.execute(
         text(
             """
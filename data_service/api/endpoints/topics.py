@@ -14,4 +14,6 @@ EndpointGenerator.add_crud_routes(
     update_schema=schemas.Topic.Record,
     response_schema=schemas.Topic.Full,
     resource_name="topic",
+    # Topics serialize no relationships, so nothing needs eager loading
+    async_reads=True,
 )
@@ -1,11 +1,14 @@
+import asyncio
 import boto3
+from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 import json
 import logging
+from sqlalchemy.exc import SQLAlchemyError
 
-from common.database.referendum import models
+from common.database.referendum import connection, models, reference_data, views
 
 from .security import get_current_user
 from .settings import settings, RequestLoggingMiddleware
@@ -40,7 +43,24 @@ logger = logging.getLogger(__name__)
 s3 = boto3.client("s3")
 ses = boto3.client("ses", region_name=settings.AWS_REGION)
 
-app = FastAPI(root_path=f"/{settings.ENVIRONMENT}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the reference data cache; if the database isn't reachable yet, the first read loads it
+    try:
+        with connection.SessionLocal() as db:
+            reference_data.cache.load(db)
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to preload reference data: {str(e)}")
+
+    view_refresher = asyncio.create_task(
+        views.refresh_views_periodically(connection.get_async_sessionmaker())
+    )
+    yield
+    view_refresher.cancel()
+
+
+app = FastAPI(root_path=f"/{settings.ENVIRONMENT}", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
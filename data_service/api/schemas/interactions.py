@@ -52,11 +52,14 @@ class BasePaginationRequestBody(CamelCaseBaseModel):
     skip: int = 0
     limit: int = 100
     search_query: Optional[str] = None
+    # next_cursor of the previous page; takes the place of skip where supported
+    cursor: Optional[str] = None
 
 
 class PaginatedResponse(CamelCaseBaseModel, Generic[T]):
     has_more: bool
     items: List[T]
+    next_cursor: Optional[str] = None
 
 
 class SortingControllerEnum(str, Enum):
@@ -1,4 +1,6 @@
-from api.tests.conftest import TestManager
+import gzip
+
+from api.tests.conftest import BILL_TEXT_BUCKET_NAME, TestManager, storage_client
 from api.tests.test_utils import assert_status_code
 
 
@@ -16,6 +18,23 @@ async def test_get_bill_text_success(test_manager: TestManager, system_headers):
     assert body["text"] == "A BILL"
 
 
+async def test_get_bill_text_gzip_encoded(test_manager: TestManager, system_headers):
+    test_bill_version = await test_manager.create_bill_version()
+    storage_client.upload_file(
+        bucket=BILL_TEXT_BUCKET_NAME,
+        key=f"{test_bill_version['hash']}.txt",
+        file_obj=gzip.compress("A COMPRESSED BILL".encode("utf-8")),
+        content_type="text/plain",
+        content_encoding="gzip",
+    )
+
+    response = await test_manager.client.get(
+        f"/bill_versions/{test_bill_version['id']}/text", headers=system_headers
+    )
+    assert_status_code(response, 200)
+    assert response.json()["text"] == "A COMPRESSED BILL"
+
+
 async def test_get_bill_briefing_success(test_manager: TestManager, system_headers):
     test_bill_version = await test_manager.create_bill_version()
     response = await test_manager.client.get(
@@ -1,9 +1,16 @@
+import asyncio
+import base64
+import json
 import logging
+from contextlib import contextmanager
+
 import pytest
+from sqlalchemy import event, text
 
 from api.tests.conftest import TestManager
-from api.tests.test_utils import assert_status_code
+from api.tests.test_utils import assert_status_code, generate_random_string
 from api.constants import YEA_VOTE_ID
+from common.database.referendum import connection, views
 
 
 async def test_get_bill_details(client, system_headers, test_manager: TestManager):
@@ -170,6 +177,190 @@ async def test_list_bill_details_sort(test_manager: TestManager):
         assert bill["title"] == sorted_test_titles[index]
 
 
+async def test_list_bill_details_cursor(test_manager: TestManager):
+    test_titles = ["Batman", "Joker", "Robin", "Bane", "Mr. Freeze"]
+    for title in test_titles:
+        await test_manager.create_bill(title=title)
+
+    titles = []
+    request = {"order_by": {"title": "descending"}, "federalOnly": False, "limit": 2}
+    for _ in range(3):
+        response = await test_manager.client.post(
+            "/bills/details", headers=test_manager.headers, json=request
+        )
+        assert_status_code(response, 200)
+        page = response.json()
+        titles.extend(bill["title"] for bill in page["items"])
+        if not page["hasMore"]:
+            break
+        request["cursor"] = page["nextCursor"]
+
+    assert page["hasMore"] == False
+    assert page["nextCursor"] is None
+    assert titles == sorted(test_titles, reverse=True)
+
+
+async def test_list_bill_details_invalid_cursor(test_manager: TestManager):
+    response = await test_manager.client.post(
+        "/bills/details",
+        headers=test_manager.headers,
+        json={"federalOnly": False, "cursor": "not-a-cursor"},
+    )
+    assert_status_code(response, 400)
+
+
+async def test_list_bill_details_cursor_for_other_sort(test_manager: TestManager):
+    for title in ["Batman", "Joker", "Robin"]:
+        await test_manager.create_bill(title=title)
+
+    request = {"order_by": {"title": "descending"}, "federalOnly": False, "limit": 1}
+    response = await test_manager.client.post(
+        "/bills/details", headers=test_manager.headers, json=request
+    )
+    assert_status_code(response, 200)
+    cursor = response.json()["nextCursor"]
+
+    request = {"order_by": {"title": "ascending"}, "federalOnly": False, "cursor": cursor}
+    response = await test_manager.client.post(
+        "/bills/details", headers=test_manager.headers, json=request
+    )
+    assert_status_code(response, 400)
+
+
+async def test_list_bill_details_tampered_cursor(test_manager: TestManager):
+    sort = [["title", "descending"], ["id", "ascending"]]
+    cursor = base64.urlsafe_b64encode(
+        json.dumps({"sort": sort, "values": ["Joker", "1 OR 1=1"]}).encode()
+    ).decode()
+
+    response = await test_manager.client.post(
+        "/bills/details",
+        headers=test_manager.headers,
+        json={"order_by": {"title": "descending"}, "federalOnly": False, "cursor": cursor},
+    )
+    assert_status_code(response, 400)
+
+
+@contextmanager
+def count_queries():
+    """Count the statements the async engine executes, and the rows they return"""
+    engine = connection.get_async_sessionmaker().kw["bind"].sync_engine
+    counts = {"statements": [], "rows": 0}
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counts["statements"].append(statement)
+        counts["rows"] += max(cursor.rowcount, 0)
+
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        yield counts
+    finally:
+        event.remove(engine, "after_cursor_execute", after_cursor_execute)
+
+
+async def test_list_bill_details_query_cost(test_manager: TestManager):
+    bills = [await test_manager.create_bill() for _ in range(2)]
+    legislators = [await test_manager.create_legislator() for _ in range(2)]
+    topics = [await test_manager.create_topic(name=generate_random_string()) for _ in range(2)]
+    for bill in bills:
+        for _ in range(2):
+            await test_manager.create_bill_version(bill_id=bill["id"])
+    links = [
+        f"/bills/{bill['id']}/{kind}/{linked['id']}"
+        for bill in bills
+        for kind, linked_resources in (("sponsors", legislators), ("topics", topics))
+        for linked in linked_resources
+    ]
+    for link in links:
+        response = await test_manager.client.post(link, headers=test_manager.headers)
+        assert_status_code(response, 204)
+
+    test_error = None
+    try:
+        with count_queries() as counts:
+            response = await test_manager.client.post(
+                "/bills/details", headers=test_manager.headers, json={"federalOnly": False}
+            )
+        assert_status_code(response, 200)
+        assert all(len(bill["sponsors"]) == 2 for bill in response.json()["items"])
+
+        # Refreshing the catalog after the writes above, then a single read of it returning one
+        # row per bill, however many sponsors, topics and versions each has
+        refresh, read = counts["statements"]
+        assert "refresh_materialized_view_if_dirty" in refresh
+        assert "FROM bill_catalog" in read and "JOIN" not in read
+        assert counts["rows"] == 1 + len(bills)
+    except Exception as e:
+        test_error = str(e)
+        logging.error(f"Test failed with {test_error}, marking and cleaning up")
+
+    for link in links:
+        response = await test_manager.client.delete(link, headers=test_manager.headers)
+        assert_status_code(response, 204)
+
+    if test_error:
+        raise Exception(test_error)
+
+
+async def test_background_refresh_cleans_bill_catalog(test_manager: TestManager):
+    await test_manager.create_bill()
+
+    refresher = asyncio.create_task(
+        views.refresh_views_periodically(connection.get_async_sessionmaker(), interval=0.1)
+    )
+    await asyncio.sleep(1)
+    refresher.cancel()
+
+    with connection.SessionLocal() as db:
+        dirty = db.execute(
+            text("SELECT dirty FROM materialized_view_refreshes WHERE view_name = 'bill_catalog'")
+        ).scalar()
+    assert dirty is False
+
+
+async def test_get_bill_query_cost(test_manager: TestManager):
+    bill = await test_manager.create_bill()
+    legislators = [await test_manager.create_legislator() for _ in range(2)]
+    topics = [await test_manager.create_topic(name=generate_random_string()) for _ in range(3)]
+    links = [f"/bills/{bill['id']}/sponsors/{legislator['id']}" for legislator in legislators]
+    links += [f"/bills/{bill['id']}/topics/{topic['id']}" for topic in topics]
+    for link in links:
+        response = await test_manager.client.post(link, headers=test_manager.headers)
+        assert_status_code(response, 204)
+
+    test_error = None
+    try:
+        with count_queries() as counts:
+            response = await test_manager.client.get(
+                f"/bills/{bill['id']}", headers=test_manager.headers
+            )
+        assert_status_code(response, 200)
+        assert len(response.json()["sponsors"]) == len(legislators)
+        assert len(response.json()["topics"]) == len(topics)
+
+        # The bill joined with its many-to-one relationships, then one query per collection
+        bill_query, *collection_queries = counts["statements"]
+        assert "FROM bills" in bill_query
+        assert len(collection_queries) == 2
+        assert counts["rows"] == 1 + len(legislators) + len(topics)
+
+        # Listing bills costs the same number of statements, however many bills there are
+        with count_queries() as counts:
+            response = await test_manager.client.get("/bills/", headers=test_manager.headers)
+        assert_status_code(response, 200)
+        assert len(counts["statements"]) == 3
+    except Exception as e:
+        test_error = str(e)
+        logging.error(f"Test failed with {test_error}, marking and cleaning up")
+
+    for link in links:
+        response = await test_manager.client.delete(link, headers=test_manager.headers)
+        assert_status_code(response, 204)
+
+    if test_error:
+        raise Exception(test_error)
+
+
 async def test_add_bill_already_exists(client, system_headers, test_manager: TestManager):
     test_bill = await test_manager.create_bill()
     bill_data = {**test_bill, "id": 9000}
@@ -0,0 +1,35 @@
+from api.tests.conftest import TestManager
+from api.tests.test_utils import assert_status_code
+
+
+async def test_list_states_etag(test_manager: TestManager):
+    response = await test_manager.client.get("/states/", headers=test_manager.headers)
+    assert_status_code(response, 200)
+    etag = response.headers["ETag"]
+
+    response = await test_manager.client.get(
+        "/states/", headers={**test_manager.headers, "If-None-Match": etag}
+    )
+    assert_status_code(response, 304)
+
+    # Writes bump the reference data generation, so the cached list is reloaded and re-tagged
+    test_state = await test_manager.create_state()
+    response = await test_manager.client.get(
+        "/states/", headers={**test_manager.headers, "If-None-Match": etag}
+    )
+    assert_status_code(response, 200)
+    assert response.headers["ETag"] != etag
+    assert test_state["id"] in [state["id"] for state in response.json()]
+
+
+async def test_get_state_cached(test_manager: TestManager):
+    test_state = await test_manager.create_state()
+    response = await test_manager.client.get(
+        f"/states/{test_state['id']}", headers=test_manager.headers
+    )
+    assert_status_code(response, 200)
+    assert response.json() == test_state
+    assert "ETag" in response.headers
+
+    response = await test_manager.client.get("/states/999999999", headers=test_manager.headers)
+    assert_status_code(response, 404)
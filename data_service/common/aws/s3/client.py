@@ -1,17 +1,49 @@
+import asyncio
+import gzip
+import io
 import os
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Union
 from io import BytesIO
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+GZIP = "gzip"
+MB = 1024 * 1024
+
+
+class IterableStream(io.RawIOBase):
+    """Read-only file-like view over an iterator of byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
 
 class S3Client:
-    def __init__(self) -> None:
+    def __init__(self, max_pool_connections: int = 10) -> None:
         self.access_key = os.getenv("AWS_ACCESS_KEY")
         self.secret_key = os.getenv("AWS_SECRET_KEY")
 
@@ -22,14 +54,24 @@ class S3Client:
         self.endpoint_url = os.getenv("S3_ENDPOINT_URL")
         self.timeout = 30
         self.max_retries = 3
+        # Upper bound on concurrent requests, shared by every thread using this client
+        self.max_pool_connections = max_pool_connections
+        # Objects above the threshold go up and down as multipart transfers of bounded parts, so a
+        # large file streams through a few part-sized buffers instead of being held whole
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * MB, multipart_chunksize=8 * MB, max_concurrency=4
+        )
 
         self.s3_client = self._create_client()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     def _create_client(self) -> Any:
         boto_config = Config(
             connect_timeout=self.timeout,
             read_timeout=self.timeout,
             retries={"max_attempts": self.max_retries},
+            max_pool_connections=self.max_pool_connections,
         )
 
         if self.endpoint_url and "localstack" in self.endpoint_url:
@@ -47,19 +89,68 @@ class S3Client:
 
         return boto3.client("s3", **client_kwargs)
 
+    async def run_async(self, method: Callable, *args, **kwargs) -> Any:
+        """Await a blocking client method on a thread pool sized to the connection pool"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_pool_connections, thread_name_prefix="s3"
+                )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(method, *args, **kwargs))
+
+    async def download_file_async(self, bucket: str, key: str) -> bytes:
+        return await self.run_async(self.download_file, bucket, key)
+
     def check_connection(self, bucket: str):
         self.s3_client.head_bucket(Bucket=bucket)
 
     def upload_file(
-        self, bucket: str, key: str, file_obj: bytes, content_type: Optional[str] = None
+        self,
+        bucket: str,
+        key: str,
+        file_obj: bytes,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
     ):
+        """Upload bytes, recording content_encoding (e.g. GZIP) when they are already encoded"""
+        self.upload_stream(bucket, key, BytesIO(file_obj), content_type, content_encoding)
+
+    def upload_stream(
+        self,
+        bucket: str,
+        key: str,
+        data: Union[BinaryIO, Iterable[bytes]],
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+    ):
+        """Upload from a binary file-like object or an iterator of byte chunks"""
+        if not hasattr(data, "read"):
+            data = IterableStream(data)
         extra_args = {"ContentType": content_type} if content_type else {}
-        self.s3_client.upload_fileobj(BytesIO(file_obj), bucket, key, ExtraArgs=extra_args)
+        if content_encoding:
+            extra_args["ContentEncoding"] = content_encoding
+        self.s3_client.upload_fileobj(
+            data, bucket, key, ExtraArgs=extra_args, Config=self.transfer_config
+        )
 
     def download_file(self, bucket: str, key: str) -> bytes:
-        buffer = BytesIO()
-        self.s3_client.download_fileobj(bucket, key, buffer)
-        return buffer.getvalue()
+        """Download an object, transparently decoding gzip Content-Encoding"""
+        response = self.s3_client.get_object(Bucket=bucket, Key=key)
+        body = response["Body"].read()
+        if response.get("ContentEncoding") == GZIP:
+            return gzip.decompress(body)
+        return body
+
+    def download_stream(self, bucket: str, key: str, file_obj: BinaryIO):
+        """Download an object as stored into a writable binary file, e.g. a temp file"""
+        self.s3_client.download_fileobj(bucket, key, file_obj, Config=self.transfer_config)
+
+    def copy_file(self, bucket: str, source_key: str, key: str):
+        """Server-side copy within a bucket, without downloading the object"""
+        self.s3_client.copy_object(
+            Bucket=bucket, Key=key, CopySource={"Bucket": bucket, "Key": source_key}
+        )
 
     def delete_file(self, bucket: str, key: str):
         self.s3_client.delete_object(Bucket=bucket, Key=key)
@@ -76,3 +167,22 @@ class S3Client:
                 filenames.extend(obj["Key"] for obj in page["Contents"])
 
         return filenames
+
+    def list_object_sizes(self, bucket: str, prefix: Optional[str] = None) -> Dict[str, int]:
+        params = {"Bucket": bucket}
+        if prefix:
+            params["Prefix"] = prefix
+
+        sizes = {}
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(**params):
+            sizes.update({obj["Key"]: obj["Size"] for obj in page.get("Contents", [])})
+
+        return sizes
+
+
+@lru_cache()
+def get_s3_client() -> S3Client:
+    """Process-wide S3Client, so credential and endpoint resolution and the connection pool are
+    set up once. boto3 clients are thread-safe, so it can be shared across requests and threads"""
+    return S3Client(max_pool_connections=int(os.getenv("S3_MAX_POOL_CONNECTIONS", 50)))
@@ -41,6 +41,8 @@ class StructuredBillText(BaseModel):
 
     title: str = Field("")
     content: List[ContentBlock] = Field(default_factory=list)
+    # Version of the parser that produced this text, unset for texts stored before it was recorded
+    parser_version: Optional[int] = None
 
     def get_plain_text(self) -> str:
         """Convert structured bill text to plain text format for backward compatibility."""
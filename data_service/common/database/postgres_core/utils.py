@@ -1,6 +1,7 @@
 import os
 import logging
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -8,7 +9,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def get_connection_string(db_name: str):
+def get_connection_string(db_name: str, driver: str = "postgresql"):
     if not db_name:
         raise ValueError("Missing db_name")
 
@@ -26,7 +27,7 @@ def get_connection_string(db_name: str):
     if not port:
         port = 5432
 
-    return f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
+    return f"{driver}://{user}:{password}@{host}:{port}/{db_name}"
 
 
 def create_session(db_name: str):
@@ -56,3 +57,23 @@ def create_session(db_name: str):
         raise
 
     return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def create_async_session(db_name: str):
+    """Session factory for AsyncSessions on an asyncpg engine, for use from the event loop
+
+    The engine connects lazily, on the first query
+    """
+    connection_string = get_connection_string(db_name, driver="postgresql+asyncpg")
+
+    logger.info(f"Creating async engine for database: {db_name}")
+    engine = create_async_engine(
+        connection_string,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        connect_args={"timeout": 30},
+    )
+
+    # Objects stay usable after commit, since their attributes can't be lazily refreshed
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
@@ -1,5 +1,18 @@
 import os
+from functools import lru_cache
 
-from common.database.postgres_core.utils import create_session
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from common.database.postgres_core.utils import create_async_session, create_session
 
 SessionLocal = create_session(db_name=os.getenv("REFERENDUM_DB_NAME"))
+
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    """AsyncSession factory, whose asyncpg engine is built on first use
+
+    Only the API reads through AsyncSessions, so the pipeline and its worker processes, which
+    import this module for SessionLocal, never create the engine
+    """
+    return create_async_session(db_name=os.getenv("REFERENDUM_DB_NAME"))
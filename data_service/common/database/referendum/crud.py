@@ -2,12 +2,13 @@ import logging
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from pydantic import BaseModel
-from sqlalchemy import Column, exists
+from sqlalchemy import Column, Row, exists, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session, attributes, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, attributes, joinedload, selectinload
 from sqlalchemy.sql.elements import BinaryExpression, ColumnElement
 
-from common.database.referendum import models, schemas
+from common.database.referendum import models, reference_data, schemas
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +78,12 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             raise ObjectNotFoundException("Object not found")
         return db_obj
 
+    async def read_async(self, db: AsyncSession, obj_id: Column[int] | int) -> ModelType:
+        db_obj = await db.get(self.model, obj_id)
+        if db_obj is None:
+            raise ObjectNotFoundException("Object not found")
+        return db_obj
+
     def read_all(
         self,
         db: Session,
@@ -101,6 +108,43 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             query = query.limit(limit)
         return query.all()
 
+    async def read_all_async(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int | None = None,
+        limit: int | None = None,
+        column_filter: ColumnElement[bool] | None = None,
+        search_filter: ColumnElement[bool] | BinaryExpression | None = None,
+        order_by: List[Column] | None = None,
+    ) -> List[ModelType]:
+        query = self._filtered_select(
+            select(self.model), skip, limit, column_filter, search_filter, order_by
+        )
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _filtered_select(
+        query,
+        skip: int | None,
+        limit: int | None,
+        column_filter: ColumnElement[bool] | None,
+        search_filter: ColumnElement[bool] | BinaryExpression | None,
+        order_by: List[Column] | None,
+    ):
+        if column_filter is not None:
+            query = query.filter(column_filter)
+        if search_filter is not None:
+            query = query.filter(search_filter)
+        if order_by:
+            query = query.order_by(*order_by)
+        if skip is not None:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
     def read_filtered(
         self,
         db: Session,
@@ -163,7 +207,110 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             raise DatabaseException(f"Database error: {str(e)}")
 
 
+class ReferenceCRUD(BaseCRUD[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """CRUD for a small lookup table, with cached reads served from the process's reference
+    data snapshot
+
+    Cached reads return immutable rows, so anything that modifies an object must still `read`
+    it from the session. Writes bump the reference data generation so every process reloads.
+    """
+
+    def read_cached(self, db: Session, obj_id: int) -> Row:
+        try:
+            row = reference_data.cache.read(db, self.model, obj_id)
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Database error: {str(e)}")
+        if row is None:
+            raise ObjectNotFoundException("Object not found")
+        return row
+
+    def read_all_cached(
+        self, db: Session, *, skip: int | None = None, limit: int | None = None
+    ) -> List[Row]:
+        try:
+            rows = reference_data.cache.read_all(db, self.model)
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Database error: {str(e)}")
+        start = skip or 0
+        return rows[start : start + limit if limit is not None else None]
+
+    def etag(self) -> str:
+        return reference_data.cache.etag(self.model)
+
+    def _bump_generation(self, db: Session):
+        try:
+            reference_data.bump_generation(db)
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise DatabaseException(f"Database error: {str(e)}")
+        reference_data.cache.invalidate()
+
+    def create(self, db: Session, obj_in: CreateSchemaType) -> ModelType:
+        db_obj = super().create(db, obj_in)
+        self._bump_generation(db)
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+    ) -> ModelType:
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        self._bump_generation(db)
+        return db_obj
+
+    def delete(self, db: Session, obj_id: int) -> None:
+        super().delete(db, obj_id)
+        self._bump_generation(db)
+
+
+def _full_bill_options() -> List:
+    """Eager loads for every relationship schemas.Bill.Full serializes
+
+    Many-to-one relationships are joined into the bill query. Collections are loaded with one
+    extra SELECT ... WHERE bill_id IN (...) each, since joining them would multiply the bill rows
+    by every combination of sponsor and topic and defeat LIMIT. Async sessions can't lazy load,
+    so this must cover every relationship the schema reads.
+    """
+    return [
+        joinedload(models.Bill.status),
+        joinedload(models.Bill.legislature),
+        joinedload(models.Bill.legislative_body),
+        selectinload(models.Bill.topics),
+        selectinload(models.Bill.sponsors),
+    ]
+
+
 class BillCRUD(BaseCRUD[models.Bill, schemas.Bill.Base, schemas.Bill.Record]):
+    async def read_async(self, db: AsyncSession, obj_id: Column[int] | int) -> models.Bill:
+        query = select(models.Bill).options(*_full_bill_options()).filter(models.Bill.id == obj_id)
+        db_bill = (await db.execute(query)).scalars().first()
+        if db_bill is None:
+            raise ObjectNotFoundException("Object not found")
+        return db_bill
+
+    async def read_all_async(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int | None = None,
+        limit: int | None = None,
+        column_filter: ColumnElement[bool] | None = None,
+        search_filter: ColumnElement[bool] | BinaryExpression | None = None,
+        order_by: List[Column] | None = None,
+    ) -> List[models.Bill]:
+        query = self._filtered_select(
+            select(models.Bill).options(*_full_bill_options()),
+            skip,
+            limit,
+            column_filter,
+            search_filter,
+            order_by,
+        )
+        return list((await db.execute(query)).scalars().all())
+
     def get_bill_user_votes(self, db: Session, bill_id: int) -> Dict[str, Union[int, float]]:
         db_bill = self.read(db=db, obj_id=bill_id)
         yea = sum(1 for vote in db_bill.user_votes if vote.vote_choice_id == 1)
@@ -182,55 +329,28 @@ class BillCRUD(BaseCRUD[models.Bill, schemas.Bill.Base, schemas.Bill.Record]):
 
         return db_bill.comments
 
-    def read_denormalized(self, db: Session, bill_id: int) -> models.Bill:
-        db_bill = (
-            db.query(models.Bill)
-            .options(
-                joinedload(models.Bill.status),
-                joinedload(models.Bill.legislative_body).joinedload(models.LegislativeBody.role),
-                joinedload(models.Bill.legislative_body).joinedload(
-                    models.LegislativeBody.legislature
-                ),
-                joinedload(models.Bill.sponsors).joinedload(models.Sponsor.legislator),
-                joinedload(models.Bill.topics),
-                joinedload(models.Bill.bill_versions),
-                joinedload(models.Bill.session),
-            )
-            .filter(models.Bill.id == bill_id)
-            .first()
-        )
-        if not db_bill:
+    async def read_catalog_entry_async(self, db: AsyncSession, bill_id: int) -> models.BillCatalog:
+        query = select(models.BillCatalog).filter(models.BillCatalog.bill_id == bill_id)
+        entry = (await db.execute(query)).scalars().first()
+        if not entry:
             raise ObjectNotFoundException(f"Bill not found for id {bill_id}")
 
-        return db_bill
+        return entry
 
-    def read_all_denormalized(
+    async def read_catalog_async(
         self,
-        db: Session,
-        skip: int = 0,
+        db: AsyncSession,
+        skip: int | None = 0,
         limit: int = 100,
         column_filter: ColumnElement[bool] | None = None,
         search_filter: BinaryExpression | ColumnElement[bool] | None = None,
         order_by: List[Column] | None = None,
-    ) -> List[models.Bill]:
-        query = db.query(models.Bill).options(
-            joinedload(models.Bill.status),
-            joinedload(models.Bill.legislative_body).joinedload(models.LegislativeBody.role),
-            joinedload(models.Bill.legislative_body).joinedload(models.LegislativeBody.legislature),
-            joinedload(models.Bill.sponsors).joinedload(models.Sponsor.legislator),
-            joinedload(models.Bill.topics),
-            joinedload(models.Bill.bill_versions),
-            joinedload(models.Bill.session),
+    ) -> List[models.BillCatalog]:
+        """Denormalized bills from the bill_catalog view, a single-table read with no joins"""
+        query = self._filtered_select(
+            select(models.BillCatalog), skip, limit, column_filter, search_filter, order_by
         )
-
-        if column_filter is not None:
-            query = query.filter(column_filter)
-        if search_filter is not None:
-            query = query.filter(search_filter)
-        if order_by:
-            query = query.order_by(*order_by)
-
-        return query.offset(skip).limit(limit).all()
+        return list((await db.execute(query)).scalars().all())
 
     def get_bill_by_legiscan_id(self, db: Session, legiscan_id: int) -> models.Bill:
         try:
@@ -392,7 +512,7 @@ class LegislatorCRUD(
 
 
 class LegislativeBodyCRUD(
-    BaseCRUD[
+    ReferenceCRUD[
         models.LegislativeBody,
         schemas.LegislativeBody.Base,
         schemas.LegislativeBody.Record,
@@ -401,19 +521,19 @@ class LegislativeBodyCRUD(
     pass
 
 
-class PartyCRUD(BaseCRUD[models.Party, schemas.Party.Base, schemas.Party.Record]):
+class PartyCRUD(ReferenceCRUD[models.Party, schemas.Party.Base, schemas.Party.Record]):
     pass
 
 
-class RoleCRUD(BaseCRUD[models.Role, schemas.Role.Base, schemas.Role.Record]):
+class RoleCRUD(ReferenceCRUD[models.Role, schemas.Role.Base, schemas.Role.Record]):
     pass
 
 
-class StateCRUD(BaseCRUD[models.State, schemas.State.Base, schemas.State.Record]):
+class StateCRUD(ReferenceCRUD[models.State, schemas.State.Base, schemas.State.Record]):
     pass
 
 
-class StatusCRUD(BaseCRUD[models.Status, schemas.Status.Base, schemas.Status.Record]):
+class StatusCRUD(ReferenceCRUD[models.Status, schemas.Status.Base, schemas.Status.Record]):
     pass
 
 
@@ -737,12 +857,12 @@ class UserVoteCRUD(BaseCRUD[models.UserVote, schemas.UserVoteCreate, schemas.Use
 
 
 class VoteChoiceCRUD(
-    BaseCRUD[models.VoteChoice, schemas.VoteChoice.Base, schemas.VoteChoice.Record]
+    ReferenceCRUD[models.VoteChoice, schemas.VoteChoice.Base, schemas.VoteChoice.Record]
 ):
     pass
 
 
-class SessionCRUD(BaseCRUD[models.Session, schemas.Session.Base, schemas.Session.Record]):
+class SessionCRUD(ReferenceCRUD[models.Session, schemas.Session.Base, schemas.Session.Record]):
     pass
 
 
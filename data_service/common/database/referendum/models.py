@@ -2,7 +2,7 @@ import datetime
 import logging
 
 from sqlalchemy import Column, Date, ForeignKey, Integer, String, Table, DateTime
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, relationship, synonym
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
 
@@ -176,6 +176,34 @@ class Bill(Base):
     sponsors = relationship("Sponsor", back_populates="bill")
 
 
+class BillCatalog(Base):
+    """Read-only, denormalized bill rows backed by the bill_catalog materialized view"""
+
+    __tablename__ = "bill_catalog"
+
+    bill_id = Column(Integer, primary_key=True)
+    legiscan_id = Column(Integer)
+    identifier = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    description = Column(String)
+    current_version_id = Column(Integer)
+    status_id = Column(Integer)
+    status = Column(String)
+    status_date = Column(Date)
+    session_id = Column(Integer)
+    session_name = Column(String)
+    state_id = Column(Integer)
+    state_name = Column(String)
+    legislative_body_id = Column(Integer)
+    role_id = Column(Integer)
+    legislative_body_role = Column(String)
+    sponsors = Column(JSONB)
+
+    # Names the bill filters and keyset pagination use for these columns
+    id = synonym("bill_id")
+    legislature_id = synonym("state_id")
+
+
 class Session(Base):
     __tablename__ = "sessions"
 
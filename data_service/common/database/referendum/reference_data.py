@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Type
+
+from sqlalchemy import Row, select, text
+from sqlalchemy.orm import Session
+
+from common.database.referendum import models
+
+logger = logging.getLogger(__name__)
+
+# Small lookup tables that change only when the ETL runs or an admin edits them
+REFERENCE_MODELS: List[Type[models.Base]] = [
+    models.State,
+    models.Party,
+    models.Role,
+    models.Status,
+    models.VoteChoice,
+    models.LegislativeBody,
+    models.Session,
+]
+
+# How long a process serves its snapshot before checking the generation again
+CHECK_INTERVAL_SECONDS = float(os.getenv("REFERENCE_DATA_CHECK_SECONDS", 5))
+
+GENERATION = text("SELECT generation FROM reference_data_generation")
+BUMP_GENERATION = text(
+    "UPDATE reference_data_generation SET generation = generation + 1 RETURNING generation"
+)
+
+
+def bump_generation(db: Session) -> int:
+    """Invalidate every process's cached reference data, e.g. after the ETL loads new rows"""
+    generation = db.execute(BUMP_GENERATION).scalar()
+    db.commit()
+    logger.info(f"Bumped reference data generation to {generation}")
+    return generation
+
+
+class ReferenceDataCache:
+    """In-process snapshot of the reference tables, tagged with the generation it was loaded at
+
+    Rows are immutable Row tuples rather than ORM objects, so the snapshot is safe to share
+    across sessions and threads. Writers bump the generation in Postgres, and each process
+    checks it at most every `check_interval` seconds before reloading every table at once.
+    """
+
+    def __init__(self, check_interval: float = CHECK_INTERVAL_SECONDS):
+        self.check_interval = check_interval
+        self.generation: Optional[int] = None
+        self._rows: Dict[Type[models.Base], Dict[int, Row]] = {}
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def load(self, db: Session):
+        # Read the generation first, so the rows are at least as new as the tag they get
+        generation = db.execute(GENERATION).scalar()
+        rows = {
+            model: {row.id: row for row in db.execute(select(model.__table__).order_by(model.id))}
+            for model in REFERENCE_MODELS
+        }
+        with self._lock:
+            self._rows = rows
+            self.generation = generation
+            self._checked_at = time.monotonic()
+        logger.info(f"Loaded reference data at generation {generation}")
+
+    def invalidate(self):
+        """Check the generation on the next read rather than waiting out the interval"""
+        self._checked_at = float("-inf")
+
+    def _refresh_if_stale(self, db: Session):
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        generation = db.execute(GENERATION).scalar()
+        if generation == self.generation:
+            self._checked_at = time.monotonic()
+            return
+        self.load(db)
+
+    def read(self, db: Session, model: Type[models.Base], obj_id: int) -> Optional[Row]:
+        self._refresh_if_stale(db)
+        return self._rows[model].get(obj_id)
+
+    def read_all(self, db: Session, model: Type[models.Base]) -> List[Row]:
+        self._refresh_if_stale(db)
+        return list(self._rows[model].values())
+
+    def etag(self, model: Type[models.Base]) -> str:
+        """Entity tag of the model's rows as of the last read"""
+        return f'"{model.__tablename__}-{self.generation}"'
+
+
+cache = ReferenceDataCache()
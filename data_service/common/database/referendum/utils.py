@@ -1,7 +1,11 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
 from enum import Enum
 from typing import Dict, List, Type
 
-from sqlalchemy import Column, and_, func
+from sqlalchemy import Column, and_, false, func, or_
 from sqlalchemy.sql.elements import BinaryExpression, ColumnElement
 
 from api.schemas.interactions import SortingControllerEnum
@@ -49,3 +53,93 @@ def create_sort_column_list(
         )
         for field, control in sort_option.items()
     ]
+
+
+def _keyset_fields(sort_option: Dict[str, SortingControllerEnum]) -> List[tuple]:
+    # The id tie-breaker appended to every sort makes the key unique
+    return [*sort_option.items(), ("id", SortingControllerEnum.ASC)]
+
+
+def encode_cursor(
+    obj: ModelType,
+    sort_option: Dict[str, SortingControllerEnum],
+) -> str:
+    """Opaque cursor holding the sort it was issued for and the sort key of the last row of a page"""
+    fields = _keyset_fields(sort_option)
+    values = [getattr(obj, field) for field, _ in fields]
+    payload = {
+        "sort": [[field, SortingControllerEnum(control).value] for field, control in fields],
+        "values": [
+            value.isoformat() if isinstance(value, (date, datetime)) else value for value in values
+        ],
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_cursor_value(column, value):
+    """The cursor value as the column's Python type, so a tampered cursor fails here and not in SQL"""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type in (date, datetime):
+        if isinstance(value, str):
+            try:
+                return python_type.fromisoformat(value)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+    elif python_type is float:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+    elif isinstance(value, python_type) and not (isinstance(value, bool) and python_type is int):
+        return value
+    raise ValueError("Invalid cursor")
+
+
+def create_keyset_filter(
+    model: Type[ModelType],
+    sort_option: Dict[str, SortingControllerEnum],
+    cursor: str,
+) -> ColumnElement[bool]:
+    """Filter to the rows sorting after the cursor's row, for the ordering built by
+    create_sort_column_list plus the id tie-breaker
+
+    Rows are compared on their sort key rather than skipped with OFFSET, so every page costs the same.
+    NULLs are placed the way Postgres orders them by default: last ascending, first descending.
+    Raises ValueError for a cursor that is malformed or was issued for a different sort
+    """
+    fields = _keyset_fields(sort_option)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict) or not isinstance(payload.get("values"), list):
+        raise ValueError("Invalid cursor")
+    sort = [[field, SortingControllerEnum(control).value] for field, control in fields]
+    if payload.get("sort") != sort or len(payload["values"]) != len(fields):
+        raise ValueError("Cursor does not match the requested sort order")
+
+    after_clauses = []
+    equal_clauses = []
+    for (field, control), value in zip(fields, payload["values"]):
+        column = getattr(model, field)
+        value = _decode_cursor_value(column, value)
+
+        descending = control == SortingControllerEnum.DESC
+        if value is None:
+            after = column.is_not(None) if descending else false()
+            equal = column.is_(None)
+        elif descending:
+            after = column < value
+            equal = column == value
+        else:
+            nullable = column.expression.nullable
+            after = or_(column > value, column.is_(None)) if nullable else column > value
+            equal = column == value
+
+        after_clauses.append(and_(*equal_clauses, after))
+        equal_clauses.append(equal)
+
+    return or_(*after_clauses)
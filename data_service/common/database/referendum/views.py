@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import os
+from contextlib import contextmanager
+from enum import Enum
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from common.database.referendum.crud import DatabaseException
+
+logger = logging.getLogger(__name__)
+
+
+class MaterializedView(str, Enum):
+    VOTE_COUNTS_BY_PARTY = "vote_counts_by_party"
+    BILL_CATALOG = "bill_catalog"
+
+
+REFRESH_IF_DIRTY = text("SELECT refresh_materialized_view_if_dirty(:view_name)")
+
+# How often the API's background refresher picks up views dirtied by writes
+REFRESH_INTERVAL_SECONDS = float(os.getenv("VIEW_REFRESH_INTERVAL_SECONDS", 30))
+
+
+def refresh_view_if_dirty(db: Session, view: MaterializedView) -> bool:
+    """Refresh the view if it has been written to since its last refresh
+
+    Returns False without refreshing when the view is clean or refreshes are suspended
+    """
+    try:
+        refreshed = db.execute(REFRESH_IF_DIRTY, {"view_name": view.value}).scalar()
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise DatabaseException(f"Database error: {str(e)}")
+
+    if refreshed:
+        logger.info(f"Refreshed materialized view {view.value}")
+    return refreshed
+
+
+async def refresh_view_if_dirty_async(db: AsyncSession, view: MaterializedView) -> bool:
+    """refresh_view_if_dirty for an AsyncSession"""
+    try:
+        refreshed = (await db.execute(REFRESH_IF_DIRTY, {"view_name": view.value})).scalar()
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseException(f"Database error: {str(e)}")
+
+    if refreshed:
+        logger.info(f"Refreshed materialized view {view.value}")
+    return refreshed
+
+
+async def refresh_views_periodically(
+    session_factory: async_sessionmaker, interval: float = REFRESH_INTERVAL_SECONDS
+):
+    """Refresh every dirty view each `interval` seconds, until cancelled
+
+    Reads still refresh a dirty view before querying it, so they never see stale rows, but with
+    this running they rarely find one dirty and pay for the refresh themselves
+    """
+    while True:
+        await asyncio.sleep(interval)
+        for view in MaterializedView:
+            try:
+                async with session_factory() as db:
+                    await refresh_view_if_dirty_async(db, view)
+            except DatabaseException as e:
+                logger.error(f"Background refresh of {view.value} failed: {str(e)}")
+
+
+@contextmanager
+def suspend_view_refresh(db: Session, view: MaterializedView):
+    """Hold off refreshes of the view for the duration of a bulk write, then refresh it once
+
+    The exclusive advisory lock lives on a dedicated connection, so it is released even if the
+    process dies mid-load
+    """
+    with db.get_bind().connect() as lock_conn:
+        lock_conn.execute(
+            text("SELECT pg_advisory_lock(hashtext(:view_name))"), {"view_name": view.value}
+        )
+        lock_conn.commit()
+        try:
+            yield
+        finally:
+            lock_conn.execute(
+                text("SELECT pg_advisory_unlock(hashtext(:view_name))"), {"view_name": view.value}
+            )
+            lock_conn.commit()
+
+    refresh_view_if_dirty(db, view)
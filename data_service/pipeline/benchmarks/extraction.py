@@ -0,0 +1,236 @@
+"""Benchmark BillTextExtractor end to end over a corpus of bill PDFs.
+
+By default the corpus is generated at run time from the seeded synthetic layouts in CORPUS, so
+its outputs are reproducible and nothing large is checked in; --corpus benchmarks a directory of
+real bill PDFs instead. Each PDF is stored, parsed and its outputs saved through a filesystem stand-in for S3Client, in
+its own process so peak RSS is attributable to that bill. Results are printed as a table and can
+be written as JSON, then compared against an earlier run to catch regressions: any change in an
+output checksum fails (unless the baseline was run with a different --compress), as does
+throughput dropping by more than --tolerance.
+
+Usage:
+    python -m pipeline.benchmarks.extraction --output results.json
+    python -m pipeline.benchmarks.extraction --baseline pipeline/benchmarks/baseline.json
+    python -m pipeline.benchmarks.extraction --corpus path/to/bills --output results.json
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Union
+
+from pipeline.bill_pdf_parser import PARSER_VERSION, BillPDFParser
+from pipeline.bill_text_extraction import BillTextExtractor
+from pipeline.benchmarks.pdf_builder import bill_pages, write_pdf
+
+BUCKET = "bill-texts"
+
+# Layouts of the generated corpus bills, passed to bill_pages
+CORPUS = {
+    # A couple of pages with no margin annotations or divisions
+    "state_short": {"page_count": 2, "seed": 1, "annotation_rate": 0, "division_rate": 0},
+    # Enrolled federal bill with margin annotations
+    "federal_enrolled": {"page_count": 12, "seed": 2, "annotation_rate": 0.06},
+    # Dense, division-heavy appropriations bill
+    "omnibus": {"page_count": 150, "seed": 3, "division_rate": 0.03, "line_height": 12},
+}
+
+
+class LocalStorageClient:
+    """S3Client stand-in that keeps objects under a local directory, one subdirectory per bucket"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, bucket: str, key: str) -> Path:
+        return self.root / bucket / key
+
+    def upload_file(
+        self,
+        bucket: str,
+        key: str,
+        file_obj: bytes,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+    ):
+        path = self._path(bucket, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(file_obj)
+
+    def upload_stream(
+        self,
+        bucket: str,
+        key: str,
+        data: Union[BinaryIO, Iterable[bytes]],
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+    ):
+        path = self._path(bucket, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as file_obj:
+            if hasattr(data, "read"):
+                shutil.copyfileobj(data, file_obj)
+            else:
+                file_obj.writelines(data)
+
+    def download_file(self, bucket: str, key: str) -> bytes:
+        return self._path(bucket, key).read_bytes()
+
+    def download_stream(self, bucket: str, key: str, file_obj: BinaryIO):
+        with open(self._path(bucket, key), "rb") as stored:
+            shutil.copyfileobj(stored, file_obj)
+
+    def copy_file(self, bucket: str, source_key: str, key: str):
+        shutil.copyfile(self._path(bucket, source_key), self._path(bucket, key))
+
+    def delete_file(self, bucket: str, key: str):
+        self._path(bucket, key).unlink(missing_ok=True)
+
+    def list_filenames(self, bucket: str, prefix: Optional[str] = None) -> List[str]:
+        return list(self.list_object_sizes(bucket, prefix))
+
+    def list_object_sizes(self, bucket: str, prefix: Optional[str] = None) -> Dict[str, int]:
+        bucket_dir = self.root / bucket
+        if not bucket_dir.exists():
+            return {}
+        return {
+            path.name: path.stat().st_size
+            for path in sorted(bucket_dir.iterdir())
+            if path.name.startswith(prefix or "")
+        }
+
+
+def generate_corpus(directory: Path):
+    for name, layout in CORPUS.items():
+        (directory / f"{name}.pdf").write_bytes(write_pdf(bill_pages(**layout)))
+
+
+def benchmark_pdf(path: str, repeat: int, compress_text: bool) -> Dict:
+    """Time extraction of one PDF; runs in a fresh worker process so ru_maxrss is its own"""
+    logging.disable(logging.INFO)
+    pdf_bytes = Path(path).read_bytes()
+    file_hash = Path(path).stem
+    with tempfile.TemporaryDirectory() as storage_dir:
+        storage_client = LocalStorageClient(storage_dir)
+        extractor = BillTextExtractor(
+            storage_client=storage_client,
+            db_session=None,
+            bucket_name=BUCKET,
+            compress_text=compress_text,
+        )
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            sizes = extractor.process_pdf(file_hash, path, pdf_bytes)
+            timings.append(time.perf_counter() - start)
+        # Linux reports kilobytes, macOS bytes
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_rss_mb = peak_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+        checksums = {
+            extension: hashlib.sha256(
+                storage_client.download_file(BUCKET, f"{file_hash}.{extension}")
+            ).hexdigest()
+            for extension in ("json", "txt")
+        }
+
+    # Counted outside the timed runs, which stream pages without retaining them
+    parser = BillPDFParser(path)
+    pages = len(parser.pages_content)
+    elements = sum(len(page) for page in parser.pages_content)
+
+    seconds = min(timings)
+    return {
+        "pages": pages,
+        "elements": elements,
+        "seconds": round(seconds, 4),
+        "pages_per_second": round(pages / seconds, 2),
+        "elements_per_second": round(elements / seconds, 1),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+        "output_bytes": sizes,
+        "checksums": checksums,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    if baseline.get("parser_version") != results["parser_version"]:
+        print(
+            f"Parser version changed ({baseline.get('parser_version')} -> "
+            f"{results['parser_version']}); expect output checksums to differ"
+        )
+    # Compressed and plain outputs never hash the same, so their checksums aren't comparable
+    compare_checksums = baseline.get("compress", False) == results["compress"]
+    if not compare_checksums:
+        print(
+            f"Baseline was run with compress={baseline.get('compress', False)}; "
+            f"skipping the output checksum comparison"
+        )
+    for name, current in results["bills"].items():
+        previous = baseline["bills"].get(name)
+        if previous is None:
+            continue
+        if compare_checksums and current["checksums"] != previous["checksums"]:
+            regressions.append(f"{name}: output checksums changed")
+        floor = previous["pages_per_second"] * (1 - tolerance)
+        if current["pages_per_second"] < floor:
+            regressions.append(
+                f"{name}: {current['pages_per_second']} pages/s, "
+                f"below {previous['pages_per_second']} - {tolerance:.0%}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3, help="Report the fastest of N runs")
+    parser.add_argument("--compress", action="store_true", help="Store gzip-compressed outputs")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Fail on regressions against earlier JSON results")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop")
+    parser.add_argument(
+        "--corpus", help="Benchmark the PDFs in this directory instead of the generated corpus"
+    )
+    args = parser.parse_args()
+
+    results = {"parser_version": PARSER_VERSION, "compress": args.compress, "bills": {}}
+    print(f"{'bill':>18} {'pages':>6} {'pages/s':>9} {'elements/s':>11} {'peak RSS':>10}")
+    with tempfile.TemporaryDirectory() as generated_dir:
+        corpus_dir = Path(args.corpus or generated_dir)
+        if not args.corpus:
+            generate_corpus(corpus_dir)
+        for path in sorted(corpus_dir.glob("*.pdf")):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(
+                    benchmark_pdf, str(path), args.repeat, args.compress
+                ).result()
+            results["bills"][path.stem] = result
+            print(
+                f"{path.stem:>18} {result['pages']:>6} {result['pages_per_second']:>9} "
+                f"{result['elements_per_second']:>11} {result['peak_rss_mb']:>8}MB"
+            )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+            output_file.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
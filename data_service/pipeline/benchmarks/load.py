@@ -0,0 +1,102 @@
+"""Compare ETLConfig load methods on a scratch copy of legislator_votes.
+
+Usage:
+    python -m pipeline.benchmarks.load --rows 500000 --repeat 3
+"""
+
+import argparse
+import logging
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from common.database.referendum import connection as referendum_connection
+from pipeline.etl_config import ETLConfig, LoadMethod
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+BENCHMARK_TABLE = "benchmark_legislator_votes"
+DESTINATION_COLUMNS = ["bill_action_id", "legislator_id", "vote_choice_id", "bill_id"]
+UNIQUE_CONSTRAINTS = ["bill_action_id", "legislator_id", "bill_id"]
+
+
+def build_votes(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    legislators = 500
+    return pd.DataFrame(
+        {
+            "bill_action_id": np.arange(rows) // legislators,
+            "legislator_id": np.arange(rows) % legislators,
+            "vote_choice_id": rng.integers(1, 5, size=rows),
+            "bill_id": np.arange(rows) // (legislators * 10),
+        }
+    )
+
+
+def reset_table(conn):
+    conn.execute(text(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}"))
+    # Copies the primary key for ON CONFLICT, but not the foreign keys
+    conn.execute(text(f"CREATE TABLE {BENCHMARK_TABLE} (LIKE legislator_votes INCLUDING ALL)"))
+    conn.commit()
+
+
+def time_load(conn, method: LoadMethod, dataframe: pd.DataFrame) -> float:
+    config = ETLConfig(
+        source="synthetic",
+        source_columns=set(DESTINATION_COLUMNS),
+        destination=BENCHMARK_TABLE,
+        destination_columns=DESTINATION_COLUMNS,
+        transformations=[],
+        unique_constraints=UNIQUE_CONSTRAINTS,
+        load_method=method,
+        dataframe=dataframe,
+    )
+    start = time.perf_counter()
+    config.load(conn)
+    return time.perf_counter() - start
+
+
+def run_benchmark(rows: int, repeat: int) -> Dict[str, Dict[str, List[float]]]:
+    votes = build_votes(rows)
+    # Same keys with new choices, so the second pass exercises the DO UPDATE branch
+    revotes = votes.assign(vote_choice_id=votes["vote_choice_id"] % 4 + 1)
+
+    results = {}
+    referendum_db = referendum_connection.SessionLocal()
+    # Loads need a Connection, as run_etl_unit passes them: COPY uses its raw DBAPI cursor
+    with referendum_db.connection() as conn:
+        try:
+            for method in LoadMethod:
+                results[method.value] = {"insert": [], "update": []}
+                for _ in range(repeat):
+                    reset_table(conn)
+                    results[method.value]["insert"].append(time_load(conn, method, votes.copy()))
+                    results[method.value]["update"].append(time_load(conn, method, revotes.copy()))
+        finally:
+            conn.execute(text(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}"))
+            conn.commit()
+    referendum_db.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.repeat)
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for method, timings in results.items():
+        for phase, samples in timings.items():
+            best = min(samples)
+            print(f"{method:>8} {phase:>6}: {best:8.3f}s  {args.rows / best:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
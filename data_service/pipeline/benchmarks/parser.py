@@ -0,0 +1,108 @@
+"""Micro-benchmark BillPDFParser page layout analysis on omnibus-sized pages.
+
+Synthetic pages skip PDF extraction so the timings isolate the parser's own work. The legacy
+per-element annotation check is reproduced here to show how it scaled.
+
+Usage:
+    python -m pipeline.benchmarks.parser --elements 250 1000 2000 --pages 3
+    python -m pipeline.benchmarks.parser --pdf path/to/bill.pdf --workers 4
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from typing import List
+
+from pipeline.bill_pdf_parser import BillPDFParser, FontInfo, TextElement
+
+WORDS = ["the", "funds", "shall", "be", "made", "available", "for", "Secretary", "program"]
+
+
+def build_page(elements: int, rng: random.Random) -> List[TextElement]:
+    page = []
+    regular = FontInfo(size=11, name="Helvetica", bold=False)
+    bold = FontInfo(size=11, name="Helvetica-Bold", bold=True)
+    for idx in range(elements):
+        y = 760 - idx * (700 / elements)
+        roll = rng.random()
+        if roll < 0.05:
+            text, x0, font = f"SEC. {idx}. SHORT TITLE.", 100, bold
+        elif roll < 0.1:
+            # Margin annotation
+            text, x0, font = f"{rng.randint(1, 50)} USC {rng.randint(100, 999)}.", 20, regular
+        else:
+            text = " ".join(rng.choice(WORDS) for _ in range(10))
+            x0, font = 100 + rng.choice([0, 0, 0, 20, 40]), regular
+        x1 = min(x0 + 6 * len(text), 520) if x0 >= 100 else 80
+        page.append(TextElement(text=text, x0=x0, y0=y, x1=x1, y1=y + 11, font=font))
+    return page
+
+
+def legacy_is_side_annotation(element: TextElement, page: List[TextElement]) -> bool:
+    """The pre-profile check, which recomputed the page's mode edges on every call"""
+    if len(page) <= 1:
+        return False
+    content = [elem for elem in page if len(elem.text) > BillPDFParser.MIN_CONTENT_LENGTH]
+    if not content:
+        return False
+    mode_left = Counter(int(elem.x0) for elem in content).most_common(1)[0][0]
+    mode_right = Counter(int(elem.x1) for elem in content).most_common(1)[0][0]
+    return element.x1 <= mode_left or element.x0 >= mode_right
+
+
+def time_parse(pages: List[List[TextElement]]) -> float:
+    start = time.perf_counter()
+    BillPDFParser.from_pages(pages).parse()
+    return time.perf_counter() - start
+
+
+def time_legacy_classification(pages: List[List[TextElement]]) -> float:
+    # Both margin calculation and content separation ran the check per element
+    start = time.perf_counter()
+    for page in pages:
+        for _ in range(2):
+            for element in page:
+                legacy_is_side_annotation(element, page)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--elements", type=int, nargs="+", default=[250, 1000, 2000])
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the current parser")
+    parser.add_argument("--pdf", help="Time extraction and parsing of a real PDF instead")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for --pdf")
+    args = parser.parse_args()
+
+    if args.pdf and args.workers > 1:
+        start = time.perf_counter()
+        content = BillPDFParser(args.pdf, max_workers=args.workers).parse().content
+        print(f"{len(content)} sections: parallel parse {time.perf_counter() - start:.3f}s")
+        return
+
+    if args.pdf:
+        start = time.perf_counter()
+        bill_parser = BillPDFParser(args.pdf)
+        extracted = time.perf_counter()
+        bill_parser.parse()
+        parsed = time.perf_counter()
+        elements = sum(len(page) for page in bill_parser.pages_content)
+        print(
+            f"{len(bill_parser.pages_content)} pages, {elements} elements: "
+            f"extract {extracted - start:.3f}s, parse {parsed - extracted:.3f}s"
+        )
+        return
+
+    rng = random.Random(0)
+    print(f"{'elements/page':>14} {'parse':>10} {'legacy check':>14}")
+    for elements in args.elements:
+        pages = [build_page(elements, rng) for _ in range(args.pages)]
+        parse_seconds = time_parse(pages)
+        legacy = "-" if args.skip_legacy else f"{time_legacy_classification(pages):.3f}s"
+        print(f"{elements:>14} {parse_seconds:>9.3f}s {legacy:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import random
+from typing import List, Tuple
+
+# (x, y, font, size, text) drawn on a page; font is "F1" (Helvetica) or "F2" (Helvetica-Bold)
+TextRun = Tuple[float, float, str, float, str]
+
+WORDS = ["the", "funds", "shall", "be", "made", "available", "for", "Secretary", "program"]
+
+
+def write_pdf(pages: List[List[TextRun]]) -> bytes:
+    """Write a minimal PDF with standard Type 1 fonts, so neither tests nor benchmarks need a PDF library"""
+    page_count = len(pages)
+    # Object numbers: 1 catalog, 2 page tree, 3-4 fonts, then a page and its content stream per page
+    page_ids = [5 + 2 * idx for idx in range(page_count)]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: (
+            f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] "
+            f"/Count {page_count} >>"
+        ).encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        4: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>",
+    }
+    for page_id, runs in zip(page_ids, pages):
+        content = "\n".join(
+            f"BT /{font} {size} Tf {x} {y} Td ({_escape(text)}) Tj ET"
+            for x, y, font, size, text in runs
+        ).encode()
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        ).encode()
+        objects[page_id + 1] = (
+            f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream"
+        )
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(pdf)
+        pdf += f"{obj_id} 0 obj\n".encode() + objects[obj_id] + b"\nendobj\n"
+
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for obj_id in sorted(objects):
+        pdf += f"{offsets[obj_id]:010d} 00000 n \n".encode()
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    return bytes(pdf)
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def bill_pages(
+    page_count: int,
+    seed: int = 0,
+    annotation_rate: float = 0.04,
+    division_rate: float = 0.02,
+    line_height: int = 16,
+) -> List[List[TextRun]]:
+    """Pages laid out like an enrolled bill: title, sections, divisions, indents and annotations"""
+    rng = random.Random(seed)
+    pages = []
+    section = 1
+    for page_idx in range(page_count):
+        runs = [(540, 770, "F1", 9, str(page_idx + 1))]
+        y = 740
+        if page_idx == 0:
+            runs += [
+                (100, 740, "F1", 11, "An Act To make appropriations for the fiscal year"),
+                (100, 724, "F1", 11, "ending September 30, and for other purposes."),
+                (20, 708, "F1", 8, "Note."),
+                (100, 692, "F1", 11, "Be it enacted by the Senate and House of Representatives"),
+            ]
+            y = 668
+        while y > 60:
+            roll = rng.random()
+            if roll < 0.08:
+                runs.append((100, y, "F2", 11, f"SEC. {section}. SHORT TITLE NUMBER {section}."))
+                section += 1
+            elif roll < 0.08 + annotation_rate:
+                annotation = f"{rng.randint(1, 99)} USC {rng.randint(100, 999)}."
+                runs.append((20, y, "F1", 8, annotation))
+            elif roll < 0.08 + annotation_rate + division_rate:
+                runs.append((100, y, "F2", 11, f"DIVISION {chr(65 + rng.randint(0, 5))}--OTHER"))
+            else:
+                text = " ".join(rng.choice(WORDS) for _ in range(10))
+                runs.append((100 + rng.choice([0, 0, 0, 20, 40]), y, "F1", 11, text))
+            y -= line_height
+        pages.append(runs)
+    return pages
@@ -1,14 +1,18 @@
 import io
+import itertools
 import re
+import sys
 import requests
-import uuid
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Union, List, Optional, Tuple
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from pydantic import BaseModel
 from pdfminer.high_level import extract_pages
-from pdfminer.layout import LTTextContainer, LTTextLine, LTChar
+from pdfminer.layout import LTChar, LTPage, LTTextContainer, LTTextLine
+from pdfminer.pdfpage import PDFPage
 
 from common.aws.s3.schemas import (
     ContentBlock,
@@ -17,9 +21,16 @@ from common.aws.s3.schemas import (
     AnnotationBlock,
 )
 
+# Bump whenever a parser change alters the structured output
+PARSER_VERSION = 1
 
-class FontInfo(BaseModel):
-    """Font metadata extracted from PDF elements."""
+
+@dataclass(frozen=True, slots=True)
+class FontInfo:
+    """Font metadata extracted from PDF elements.
+
+    Instances are immutable and shared between every element using the same font.
+    """
 
     size: Optional[float] = None
     name: Optional[str] = None
@@ -28,20 +39,26 @@ class FontInfo(BaseModel):
     @classmethod
     def from_pdf_element(cls, element: LTTextContainer) -> "FontInfo":
         """Extract font information from a PDF text container."""
-        font_info = cls()
-
         for text_line in element._objs:
             if isinstance(text_line, LTTextLine):
                 for char in text_line:
                     if isinstance(char, LTChar):
-                        font_info.size = char.size
-                        font_info.name = char.fontname
-                        font_info.bold = "Bold" in char.fontname
-                        return font_info
-        return font_info
+                        return _shared_font(char.size, char.fontname)
+        return _NO_FONT
+
+
+@lru_cache(maxsize=4096)
+def _shared_font(size: float, name: str) -> FontInfo:
+    return FontInfo(size=size, name=sys.intern(name), bold="Bold" in name)
 
 
-class TextElement(BaseModel):
+_NO_FONT = FontInfo()
+
+SECTION_HEADER_PATTERN = re.compile(r"^SEC(?:TION)?\.?\s*\d+\.", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class TextElement:
     """A positioned text element with font information."""
 
     text: str
@@ -54,8 +71,7 @@ class TextElement(BaseModel):
     @property
     def is_section_header(self) -> bool:
         """Check if text matches section header pattern and formatting."""
-        section_pattern = r"^SEC(?:TION)?\.?\s*\d+\."
-        return bool(re.match(section_pattern, self.text, re.IGNORECASE)) and (
+        return bool(SECTION_HEADER_PATTERN.match(self.text)) and (
             self.font.bold or (self.font.size and self.font.size > 10)
         )
 
@@ -65,6 +81,29 @@ class TextElement(BaseModel):
         return self.text.strip().startswith("DIVISION") and self.font.bold
 
 
+def _mode(values: Iterable[int]) -> int:
+    return Counter(values).most_common(1)[0][0]
+
+
+@dataclass(slots=True)
+class PageLayout:
+    """Layout profile of a page, computed once and shared by every per-element check."""
+
+    # Most common left/right edges of main content; None when the page has no main content
+    mode_left: Optional[int] = None
+    mode_right: Optional[int] = None
+    # Most common left edge of body text, used as the page's base margin for indentation
+    base_margin: Optional[int] = None
+    annotations: List[TextElement] = field(default_factory=list)
+    body: List[TextElement] = field(default_factory=list)
+
+    def is_side_annotation(self, element: TextElement) -> bool:
+        """Check if element sits outside the page's main content column."""
+        if self.mode_left is None:
+            return False
+        return element.x1 <= self.mode_left or element.x0 >= self.mode_right
+
+
 class BillPDFParser:
     """Extracts structured content from legislative PDFs."""
 
@@ -75,7 +114,15 @@ class BillPDFParser:
     MAX_INDENT = 10  # Maximum allowed indent level
     MIN_CONTENT_LENGTH = 10  # Minimum length for main content
 
-    def __init__(self, source: str | io.BytesIO, start_page_idx: int = 0) -> None:
+    PAGES_PER_RANGE = 20  # Pages per worker task when parsing in parallel
+
+    def __init__(
+        self,
+        source: str | io.BytesIO,
+        start_page_idx: int = 0,
+        stream: bool = False,
+        max_workers: int = 1,
+    ) -> None:
         if isinstance(source, str):
             if source.startswith("http://") or source.startswith("https://"):
                 response = requests.get(source)
@@ -85,67 +132,175 @@ class BillPDFParser:
                 self.pdf_path = Path(source)
                 self.pdf_bytes = None
         else:
+            self.pdf_path = None
             self.pdf_bytes = source
 
         self.start_page_idx = start_page_idx
+        # With max_workers > 1, page ranges are laid out in worker processes and streamed back in
+        # order. In streaming mode pages are extracted lazily while parsing and not retained
+        self.max_workers = max_workers
+        self.stream = stream or max_workers > 1
 
         # Initialize parser state
-        self.bill_data = StructuredBillText()
+        self.bill_data = StructuredBillText(parser_version=PARSER_VERSION)
         self.pages_content: List[List[TextElement]] = []
+        self.page_layouts: List[PageLayout] = []
         self.page_margins: Dict[int, float] = {}
+        self._id_counter = itertools.count(1)
 
-        self._extract_pdf_content()
-        self._calculate_page_margins()
+        if not self.stream:
+            self._extract_pdf_content()
+            self._calculate_page_margins()
+
+    @classmethod
+    def from_pages(
+        cls, pages_content: List[List[TextElement]], start_page_idx: int = 0
+    ) -> "BillPDFParser":
+        """Build a parser over already extracted page elements, e.g. for benchmarks."""
+        parser = cls.__new__(cls)
+        parser.pdf_path = None
+        parser.pdf_bytes = None
+        parser.start_page_idx = start_page_idx
+        parser.max_workers = 1
+        parser.stream = False
+        parser.bill_data = StructuredBillText(parser_version=PARSER_VERSION)
+        parser._id_counter = itertools.count(1)
+        parser.pages_content = pages_content
+        parser.page_layouts = []
+        parser.page_margins = {}
+        parser._calculate_page_margins()
+        return parser
 
     def parse(self) -> StructuredBillText:
         """Parse the full bill into structured data."""
-        self._parse_header()
-        self._parse_sections()
+        self.bill_data.content.extend(self.iter_sections())
+        self._clean_up_sections()
         return self.bill_data
 
+    def iter_sections(self) -> Iterator[ContentBlock]:
+        """Yield each non-empty section as soon as the next one starts.
+
+        In streaming mode only the page being parsed is held in memory. The bill title is set on
+        bill_data once the start page has been parsed.
+        """
+        yield from self._build_sections(self._iter_pages())
+
+    def _iter_pages(self) -> Iterator[Tuple[int, List[TextElement], PageLayout]]:
+        if not self.stream:
+            yield from zip(itertools.count(), self.pages_content, self.page_layouts)
+            return
+
+        if self.max_workers > 1:
+            yield from self._iter_pages_parallel()
+            return
+
+        source = self.pdf_bytes if self.pdf_bytes is not None else self.pdf_path
+        for page_idx, page_layout in enumerate(extract_pages(source)):
+            page_elements = self._extract_page_elements(page_layout)
+            yield page_idx, page_elements, self._profile_page(page_elements)
+
+    def _iter_pages_parallel(self) -> Iterator[Tuple[int, List[TextElement], PageLayout]]:
+        """Lay out page ranges in worker processes and yield their pages in document order.
+
+        Sections are still assembled serially from the ordered pages, so a section left open at the
+        end of one range simply continues into the next and the output matches a serial parse.
+        """
+        if self.pdf_bytes is not None:
+            source = self.pdf_bytes.getvalue()
+            page_count = _count_pages(io.BytesIO(source))
+        else:
+            source = str(self.pdf_path)
+            with open(source, "rb") as pdf_file:
+                page_count = _count_pages(pdf_file)
+
+        ranges = [
+            (start, min(start + self.PAGES_PER_RANGE, page_count))
+            for start in range(0, page_count, self.PAGES_PER_RANGE)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_range_worker, initargs=(source,)
+        ) as executor:
+            # Keep a couple of ranges per worker in flight so finished ranges don't pile up
+            pending = deque()
+            remaining = iter(ranges)
+            for start, stop in itertools.islice(remaining, 2 * self.max_workers):
+                pending.append(executor.submit(_extract_page_range, start, stop))
+
+            while pending:
+                pages = pending.popleft().result()
+                next_range = next(remaining, None)
+                if next_range is not None:
+                    pending.append(executor.submit(_extract_page_range, *next_range))
+                yield from pages
+
     def _extract_pdf_content(self) -> None:
         """Extract all text elements and their positioning from the PDF."""
         source = self.pdf_bytes if self.pdf_bytes is not None else self.pdf_path
         pages = extract_pages(source)
 
         for page_layout in pages:
-            page_elements = []
-
-            for element in page_layout:
-                if isinstance(element, LTTextContainer):
-                    text = element.get_text().strip()
-                    if text:
-                        text_element = TextElement(
-                            text=text,
-                            x0=element.bbox[0],
-                            y0=element.bbox[1],
-                            x1=element.bbox[2],
-                            y1=element.bbox[3],
-                            font=FontInfo.from_pdf_element(element),
-                        )
-                        page_elements.append(text_element)
-
-            self.pages_content.append(page_elements)
+            self.pages_content.append(self._extract_page_elements(page_layout))
+
+    def _extract_page_elements(self, page_layout: LTPage) -> List[TextElement]:
+        """Extract the text elements and their positioning from a page layout."""
+        page_elements = []
+
+        for element in page_layout:
+            if isinstance(element, LTTextContainer):
+                text = element.get_text().strip()
+                if text:
+                    text_element = TextElement(
+                        text=text,
+                        x0=element.bbox[0],
+                        y0=element.bbox[1],
+                        x1=element.bbox[2],
+                        y1=element.bbox[3],
+                        font=FontInfo.from_pdf_element(element),
+                    )
+                    page_elements.append(text_element)
+
+        return page_elements
 
     def _calculate_page_margins(self) -> None:
-        """Determine the base left margin for each page."""
-        for page_idx, page in enumerate(self.pages_content):
-            if not page:
+        """Profile each page's layout and determine its base left margin."""
+        self.page_layouts = [self._profile_page(page) for page in self.pages_content]
+        self.page_margins = {
+            page_idx: layout.base_margin
+            for page_idx, layout in enumerate(self.page_layouts)
+            if layout.base_margin is not None
+        }
+
+    def _profile_page(self, page: List[TextElement]) -> PageLayout:
+        """Compute mode edges, annotation split and base margin for a page in a single pass."""
+        layout = PageLayout()
+        if not page:
+            return layout
+
+        # Mode edges of main content
+        if len(page) > 1:
+            content_elements = [elem for elem in page if len(elem.text) > self.MIN_CONTENT_LENGTH]
+            if content_elements:
+                layout.mode_left = _mode(int(elem.x0) for elem in content_elements)
+                layout.mode_right = _mode(int(elem.x1) for elem in content_elements)
+
+        # Separate annotations from main content
+        for element in page:
+            if self._is_metadata(element):
                 continue
 
-            # Filter for main content elements
-            content_elements = [
-                elem
-                for elem in page
-                if len(elem.text) > self.MIN_CONTENT_LENGTH
-                and not self._is_metadata(elem)
-                and not self._is_side_annotation(elem, page)
-            ]
+            if layout.is_side_annotation(element):
+                layout.annotations.append(element)
+            else:
+                layout.body.append(element)
 
-            if content_elements:
-                # Use most common left margin as the base
-                left_margins = [int(elem.x0) for elem in content_elements]
-                self.page_margins[page_idx] = Counter(left_margins).most_common(1)[0][0]
+        # Use most common left margin of main content as the base
+        left_margins = [
+            int(elem.x0) for elem in layout.body if len(elem.text) > self.MIN_CONTENT_LENGTH
+        ]
+        if left_margins:
+            layout.base_margin = _mode(left_margins)
+
+        return layout
 
     def _is_metadata(self, element: TextElement) -> bool:
         """Identify page metadata like numbers and stats."""
@@ -154,45 +309,23 @@ class BillPDFParser:
         is_page_num = element.x0 > (self.PAGE_WIDTH * 0.8) and re.match(r"^\d+$", text)
         return is_stat or is_page_num
 
-    def _is_side_annotation(
-        self, text_element: TextElement, page_elements: List[TextElement]
-    ) -> bool:
-        """Determine if element is a margin annotation based on positioning."""
-        if len(page_elements) <= 1:
-            return False
-
-        # Calculate mode edges for main content
-        content_elements = [
-            elem for elem in page_elements if len(elem.text) > self.MIN_CONTENT_LENGTH
-        ]
-        if not content_elements:
-            return False
-
-        left_edges = [int(elem.x0) for elem in content_elements]
-        right_edges = [int(elem.x1) for elem in content_elements]
-
-        mode_left = Counter(left_edges).most_common(1)[0][0]
-        mode_right = Counter(right_edges).most_common(1)[0][0]
-
-        return text_element.x1 <= mode_left or text_element.x0 >= mode_right
-
-    def _calculate_indent_level(self, text_element: TextElement, page_idx: int) -> int:
+    def _calculate_indent_level(self, text_element: TextElement, layout: PageLayout) -> int:
         """Calculate indent level relative to page's base margin."""
         if text_element.is_section_header:
             return 0
 
-        base_margin = self.page_margins.get(page_idx, self.INDENT_STEP)
+        base_margin = self.INDENT_STEP if layout.base_margin is None else layout.base_margin
         relative_margin = text_element.x0 - base_margin
         indent_level = max(0, int(relative_margin / self.INDENT_STEP))
 
         return min(indent_level, self.MAX_INDENT)
 
-    def _parse_header(self) -> None:
-        """Extract bill metadata from the header section."""
-        if not self.pages_content:
-            return
+    def _next_id(self) -> str:
+        """Sequential block id suffix, so repeated parses produce identical output."""
+        return f"{next(self._id_counter):08x}"
 
-        start_page = self.pages_content[self.start_page_idx]
+    def _parse_header(self, start_page: List[TextElement], start_layout: PageLayout) -> None:
+        """Extract bill metadata from the header section."""
         for idx, element in enumerate(start_page):
             if "An Act" not in element.text:
                 continue
@@ -204,64 +337,46 @@ class BillPDFParser:
                 if any(phrase in next_elem.text for phrase in ("Be it enacted", "Be  it  enacted")):
                     break
 
-                if not self._is_side_annotation(next_elem, start_page):
+                if not start_layout.is_side_annotation(next_elem):
                     title_parts.append(next_elem.text)
 
             title = " ".join(title_parts)
             self.bill_data.title = title.replace("An Act", "").strip()
             break
 
-    def _parse_sections(self) -> None:
-        """Parse all sections of the bill."""
+    def _build_sections(
+        self, pages: Iterable[Tuple[int, List[TextElement], PageLayout]]
+    ) -> Iterator[ContentBlock]:
+        """Parse pages into sections, yielding each non-empty section once it is complete."""
         current_section = None
-        for page_idx, page in enumerate(
-            self.pages_content[self.start_page_idx :], start=self.start_page_idx
-        ):
-            if not page:
+        for page_idx, page, layout in pages:
+            if page_idx == self.start_page_idx:
+                self._parse_header(page, layout)
+
+            if page_idx < self.start_page_idx or not page:
                 continue
 
             try:
-                annotation_content, body_content = self._separate_content(page)
-
-                for element in body_content:
-                    section = self._process_content_element(element, current_section, page_idx)
+                for element in layout.body:
+                    section = self._process_content_element(element, current_section, layout)
 
                     if section is not None:
                         if current_section and section.id != current_section.id:
-                            self.bill_data.content.append(current_section)
+                            if current_section.content:
+                                yield current_section
                         current_section = section
 
-                if current_section and annotation_content:
-                    self._process_annotations(annotation_content, current_section)
+                if current_section and layout.annotations:
+                    self._process_annotations(layout.annotations, current_section)
 
             except Exception as e:
                 print(f"Warning: Error processing page {page_idx}: {e}")
 
-        if current_section:
-            self.bill_data.content.append(current_section)
-
-        self._clean_up_sections()
-
-    def _separate_content(
-        self, page: List[TextElement]
-    ) -> Tuple[List[TextElement], List[TextElement]]:
-        """Separate annotations from main content."""
-        annotation_content = []
-        main_content = []
-
-        for element in page:
-            if self._is_metadata(element):
-                continue
-
-            if self._is_side_annotation(element, page):
-                annotation_content.append(element)
-            else:
-                main_content.append(element)
-
-        return annotation_content, main_content
+        if current_section and current_section.content:
+            yield current_section
 
     def _process_content_element(
-        self, element: TextElement, current_section: Optional[ContentBlock], page_idx: int
+        self, element: TextElement, current_section: Optional[ContentBlock], layout: PageLayout
     ) -> Optional[ContentBlock]:
         """Process a content element and update section structure."""
         if element.is_section_header:
@@ -273,7 +388,7 @@ class BillPDFParser:
         if element.is_division_header:
             return self._create_division_block(element)
 
-        self._add_content_block(current_section, element, page_idx)
+        self._add_content_block(current_section, element, layout)
         return current_section
 
     def _create_section_block(self, element: TextElement) -> ContentBlock:
@@ -289,23 +404,23 @@ class BillPDFParser:
             )
 
         return ContentBlock(
-            id=f"sec-unknown-{uuid.uuid4().hex[:8]}", text="Section", type=ContentBlockType.SECTION
+            id=f"sec-unknown-{self._next_id()}", text="Section", type=ContentBlockType.SECTION
         )
 
     def _create_division_block(self, element: TextElement) -> ContentBlock:
         """Create a new division block."""
         return ContentBlock(
-            id=f"division-{uuid.uuid4().hex[:8]}",
+            id=f"division-{self._next_id()}",
             text=element.text.strip(),
             type=ContentBlockType.DIVISION,
         )
 
     def _add_content_block(
-        self, section: ContentBlock, element: TextElement, page_idx: int
+        self, section: ContentBlock, element: TextElement, layout: PageLayout
     ) -> None:
         """Add a content block to the current section."""
-        block_id = f"{section.id}-block-{uuid.uuid4().hex[:8]}"
-        indent_level = self._calculate_indent_level(element, page_idx)
+        block_id = f"{section.id}-block-{self._next_id()}"
+        indent_level = self._calculate_indent_level(element, layout)
 
         content_block = ContentBlock(
             id=block_id,
@@ -323,7 +438,7 @@ class BillPDFParser:
         """Process and attach annotations to content blocks."""
         for annotation_element in annotation_elements:
             annotation = AnnotationBlock(
-                id=f"{section.id}-annotation-{uuid.uuid4().hex[:8]}",
+                id=f"{section.id}-annotation-{self._next_id()}",
                 content=annotation_element.text,
             )
             section.annotations.append(annotation)
@@ -348,3 +463,27 @@ class BillPDFParser:
     def _clean_up_sections(self) -> None:
         """Remove empty sections and temporary data."""
         self.bill_data.content = [block for block in self.bill_data.content if block.content]
+
+
+def _count_pages(pdf_file: BinaryIO) -> int:
+    return sum(1 for _ in PDFPage.get_pages(pdf_file))
+
+
+# Source PDF of the page-range worker process, set once by the pool initializer
+_range_source: Optional[Union[str, io.BytesIO]] = None
+
+
+def _init_range_worker(source: Union[str, bytes]):
+    global _range_source
+    _range_source = io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _extract_page_range(start: int, stop: int) -> List[Tuple[int, List[TextElement], PageLayout]]:
+    """Extract and profile pages [start, stop) of the worker's PDF."""
+    parser = BillPDFParser.from_pages([])
+    pages = []
+    page_layouts = extract_pages(_range_source, page_numbers=range(start, stop))
+    for page_idx, page_layout in zip(range(start, stop), page_layouts):
+        page_elements = parser._extract_page_elements(page_layout)
+        pages.append((page_idx, page_elements, parser._profile_page(page_elements)))
+    return pages
@@ -1,83 +1,822 @@
+import gzip
+import hashlib
 import io
-from typing import Set, Dict
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from sqlalchemy import text
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from pathlib import Path
 
+from common.aws.s3.client import GZIP, S3Client
 from common.aws.s3.schemas import StructuredBillText
-from pipeline.bill_pdf_parser import BillPDFParser
+from pipeline.bill_pdf_parser import PARSER_VERSION, BillPDFParser
+from pipeline.pdf_downloader import DownloadedPDF, DownloadStatus, PDFDownloader
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+class TimeoutException(Exception):
+    pass
+
+
+@contextmanager
+def timeout(seconds):
+    """Raise TimeoutException in the main thread after `seconds`
+
+    Signals are only checked between bytecodes, so this cannot interrupt long-running C calls
+    """
+
+    def handler(signum, frame):
+        raise TimeoutException("Timed out")
+
+    signal.signal(signal.SIGALRM, handler)
+    signal.alarm(seconds)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+
+
+def is_permanent_failure(error: BaseException) -> bool:
+    """Client errors such as 404 or 410 won't fix themselves by retrying soon"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return 400 <= status < 500 and status not in (408, 429)
+    return False
+
+
+def _is_transient(error: BaseException) -> bool:
+    return not is_permanent_failure(error)
+
+
+@dataclass
+class TextSource:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+
 
 class BillTextExtractor:
     CHUNK_SIZE = 32768
+    # Downloaded PDFs larger than this are spooled to a temp file and handed to workers by path
+    SPOOL_THRESHOLD = 8 * 1024 * 1024
+    POOL_SIZE = 32
+    RESULT_EXTENSIONS = ("pdf", "json", "txt")
+    PROCESSED = "processed"
+    # Outputs stored before the manifest recorded which parser produced them
+    LEGACY_PARSER_VERSION = 0
+    # Failed bills are retried after RETRY_BASE_SECONDS, doubling per attempt up to
+    # RETRY_MAX_SECONDS, and dead-lettered after MAX_ATTEMPTS
+    MAX_ATTEMPTS = 5
+    RETRY_BASE_SECONDS = 6 * 60 * 60
+    RETRY_MAX_SECONDS = 14 * 24 * 60 * 60
 
-    def __init__(self, storage_client, db_session, bucket_name: str):
+    def __init__(self, storage_client, db_session, bucket_name: str, compress_text: bool = False):
         self.storage_client = storage_client
         self.db_session = db_session
         self.bucket_name = bucket_name
+        # Store .json/.txt outputs gzip-compressed; S3Client.download_file decodes them
+        self.compress_text = compress_text
+        # Keep-alive connections shared by the download threads
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Validators and content hashes recorded by previous runs, see load_text_sources
+        self.text_sources: Dict[str, TextSource] = {}
+        self.content_index: Dict[str, str] = {}
+
+    def get_unprocessed_bill_texts(self) -> Dict[str, str]:
+        """Map the hash of every bill version without processed text to its URL"""
+        query = """
+            SELECT bv.hash, bv.url
+            FROM bill_versions bv
+            LEFT JOIN bill_text_manifest m ON m.hash = bv.hash AND m.status = :processed
+            LEFT JOIN bill_text_failures f ON f.hash = bv.hash
+            WHERE bv.url IS NOT NULL
+            AND bv.hash IS NOT NULL
+            AND m.hash IS NULL
+            AND (f.hash IS NULL OR (NOT f.dead_letter AND f.next_attempt_at <= NOW()))
+        """
+        result = self.db_session.execute(text(query), {"processed": self.PROCESSED})
+        return {row[0]: row[1] for row in result}
 
-    def get_required_bill_text_hash_map(self) -> Dict:
+    def get_processed_bill_texts(self) -> Dict[str, str]:
+        """Map the hash of every bill version with processed text to its URL"""
         query = """
-            SELECT hash, url
-            FROM bill_versions
-            WHERE url IS NOT NULL
-            AND hash IS NOT NULL
+            SELECT bv.hash, bv.url
+            FROM bill_versions bv
+            JOIN bill_text_manifest m ON m.hash = bv.hash AND m.status = :processed
+            LEFT JOIN bill_text_failures f ON f.hash = bv.hash
+            WHERE bv.url IS NOT NULL
+            AND (f.hash IS NULL OR (NOT f.dead_letter AND f.next_attempt_at <= NOW()))
         """
-        result = self.db_session.execute(text(query))
+        result = self.db_session.execute(text(query), {"processed": self.PROCESSED})
         return {row[0]: row[1] for row in result}
 
-    def get_stored_hashes(self) -> Set[str]:
-        """Get set of bill text hashes already stored"""
-        existing_files = self.storage_client.list_filenames(self.bucket_name)
-        return {Path(filename).stem for filename in existing_files}
+    def get_deferred_failure_counts(self) -> Dict[str, int]:
+        """Count failed bills skipped by this run: still backing off, or dead-lettered"""
+        result = self.db_session.execute(
+            text(
+                """
+                SELECT
+                    COUNT(*) FILTER (WHERE NOT dead_letter AND next_attempt_at > NOW()),
+                    COUNT(*) FILTER (WHERE dead_letter)
+                FROM bill_text_failures
+            """
+            )
+        ).one()
+        return {"backing_off": result[0], "dead_letter": result[1]}
+
+    def get_outdated_bill_texts(self) -> List[str]:
+        """Hashes of processed bill texts produced by an older version of the parser"""
+        query = """
+            SELECT hash
+            FROM bill_text_manifest
+            WHERE status = :processed
+            AND parser_version < :parser_version
+            ORDER BY hash
+        """
+        result = self.db_session.execute(
+            text(query), {"processed": self.PROCESSED, "parser_version": PARSER_VERSION}
+        )
+        return [row[0] for row in result]
+
+    def backfill_manifest(self) -> int:
+        """Seed an empty manifest from the bucket contents written before it existed
+
+        Only hashes with all of their outputs stored are recorded. Their parser version is unknown,
+        so they are stamped with LEGACY_PARSER_VERSION
+        """
+        is_empty = self.db_session.execute(
+            text("SELECT NOT EXISTS (SELECT 1 FROM bill_text_manifest)")
+        ).scalar()
+        if not is_empty:
+            return 0
+
+        sizes_by_hash: Dict[str, Dict[str, int]] = {}
+        for key, size in self.storage_client.list_object_sizes(self.bucket_name).items():
+            path = Path(key)
+            sizes_by_hash.setdefault(path.stem, {})[path.suffix.lstrip(".")] = size
+
+        rows = [
+            {
+                "hash": file_hash,
+                "status": self.PROCESSED,
+                "parser_version": self.LEGACY_PARSER_VERSION,
+                "pdf_bytes": sizes["pdf"],
+                "json_bytes": sizes["json"],
+                "txt_bytes": sizes["txt"],
+            }
+            for file_hash, sizes in sizes_by_hash.items()
+            if all(extension in sizes for extension in self.RESULT_EXTENSIONS)
+        ]
+        if rows:
+            self.db_session.execute(
+                text(
+                    """
+                    INSERT INTO bill_text_manifest
+                        (hash, status, parser_version, pdf_bytes, json_bytes, txt_bytes)
+                    VALUES
+                        (:hash, :status, :parser_version, :pdf_bytes, :json_bytes, :txt_bytes)
+                    ON CONFLICT (hash) DO NOTHING
+                """
+                ),
+                rows,
+            )
+        self.db_session.commit()
+        return len(rows)
 
     @retry(
-        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10), reraise=True
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception(_is_transient),
+        reraise=True,
     )
     def download_pdf(self, url: str) -> bytes:
-        response = requests.get(url, timeout=30)
+        response = self.session.get(url, timeout=30)
         response.raise_for_status()
         return response.content
 
-    def save_pdf(self, pdf_bytes: bytes, file_hash: str) -> None:
-        """Store PDF file in object storage"""
-        self.storage_client.upload_file(
-            bucket=self.bucket_name,
-            key=f"{file_hash}.pdf",
-            file_obj=pdf_bytes,
+    def load_text_sources(self):
+        """Load the validators and content hash recorded for each processed URL"""
+        result = self.db_session.execute(
+            text("SELECT url_hash, etag, last_modified, content_hash FROM bill_text_sources")
+        )
+        self.text_sources = {
+            url_hash: TextSource(etag=etag, last_modified=last_modified, content_hash=content_hash)
+            for url_hash, etag, last_modified, content_hash in result
+        }
+        self.content_index = {
+            source.content_hash: url_hash for url_hash, source in self.text_sources.items()
+        }
+
+    def record_result(self, pdf: DownloadedPDF):
+        """Record a successfully handled PDF in the source ledger and the processed-text manifest
+
+        Called once the outputs are uploaded, so a manifest row always implies stored outputs
+        """
+        try:
+            self.db_session.execute(
+                text(
+                    """
+                    INSERT INTO bill_text_sources (url_hash, url, etag, last_modified, content_hash)
+                    VALUES (:url_hash, :url, :etag, :last_modified, :content_hash)
+                    ON CONFLICT (url_hash) DO UPDATE SET
+                        etag = EXCLUDED.etag,
+                        last_modified = EXCLUDED.last_modified,
+                        checked_at = NOW(),
+                        updated_at = CASE
+                            WHEN bill_text_sources.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                            THEN NOW()
+                            ELSE bill_text_sources.updated_at
+                        END,
+                        content_hash = EXCLUDED.content_hash
+                """
+                ),
+                {
+                    "url_hash": pdf.url_hash,
+                    "url": pdf.url,
+                    "etag": pdf.etag,
+                    "last_modified": pdf.last_modified,
+                    "content_hash": pdf.content_hash,
+                },
+            )
+
+            if pdf.status == DownloadStatus.DOWNLOADED:
+                self._upsert_manifest(
+                    """
+                    VALUES (:hash, :status, :parser_version, :pdf_bytes, :json_bytes, :txt_bytes)
+                """,
+                    {
+                        "hash": pdf.url_hash,
+                        "status": self.PROCESSED,
+                        "parser_version": PARSER_VERSION,
+                        "pdf_bytes": pdf.output_sizes.get("pdf"),
+                        "json_bytes": pdf.output_sizes.get("json"),
+                        "txt_bytes": pdf.output_sizes.get("txt"),
+                    },
+                )
+            elif pdf.status == DownloadStatus.COPIED:
+                self._upsert_manifest(
+                    """
+                    SELECT :hash, status, parser_version, pdf_bytes, json_bytes, txt_bytes
+                    FROM bill_text_manifest
+                    WHERE hash = :copied_from
+                """,
+                    {"hash": pdf.url_hash, "copied_from": pdf.copied_from},
+                )
+
+            self.db_session.execute(
+                text("DELETE FROM bill_text_failures WHERE hash = :hash"), {"hash": pdf.url_hash}
+            )
+            self.db_session.commit()
+        except Exception:
+            self.db_session.rollback()
+            raise
+
+        self.text_sources[pdf.url_hash] = TextSource(
+            etag=pdf.etag, last_modified=pdf.last_modified, content_hash=pdf.content_hash
         )
+        self.content_index.setdefault(pdf.content_hash, pdf.url_hash)
+
+    def record_failure(self, url_hash: str, url: str, error: BaseException) -> bool:
+        """Record a failed attempt and schedule the next one, returning True if dead-lettered
+
+        Permanent failures are dead-lettered straight away, others once they reach MAX_ATTEMPTS
+        """
+        try:
+            dead_letter = self.db_session.execute(
+                text(
+                    """
+                    INSERT INTO bill_text_failures
+                        (hash, url, error_class, error_message, dead_letter, next_attempt_at)
+                    VALUES (
+                        :hash, :url, :error_class, :error_message, :permanent,
+                        NOW() + make_interval(secs => :base_seconds)
+                    )
+                    ON CONFLICT (hash) DO UPDATE SET
+                        url = EXCLUDED.url,
+                        error_class = EXCLUDED.error_class,
+                        error_message = EXCLUDED.error_message,
+                        attempts = bill_text_failures.attempts + 1,
+                        dead_letter = EXCLUDED.dead_letter
+                            OR bill_text_failures.attempts + 1 >= :max_attempts,
+                        last_failed_at = NOW(),
+                        next_attempt_at = NOW() + make_interval(secs => LEAST(
+                            :base_seconds * power(2, bill_text_failures.attempts), :max_seconds
+                        ))
+                    RETURNING dead_letter
+                """
+                ),
+                {
+                    "hash": url_hash,
+                    "url": url,
+                    "error_class": type(error).__name__,
+                    "error_message": str(error)[:1000],
+                    "permanent": is_permanent_failure(error),
+                    "base_seconds": self.RETRY_BASE_SECONDS,
+                    "max_seconds": self.RETRY_MAX_SECONDS,
+                    "max_attempts": self.MAX_ATTEMPTS,
+                },
+            ).scalar()
+            self.db_session.commit()
+        except Exception:
+            self.db_session.rollback()
+            raise
+        return dead_letter
 
-    def save_text_results(self, structured_text: StructuredBillText, file_hash: str) -> None:
-        """Store extracted text in object storage"""
-        json_string = structured_text.model_dump_json()
-        self.storage_client.upload_file(
-            bucket=self.bucket_name,
-            key=f"{file_hash}.json",
-            file_obj=json_string.encode("utf-8"),
+    def record_reparse(self, file_hash: str, sizes: Dict[str, int]):
+        """Stamp a re-parsed bill text with the current parser version"""
+        try:
+            self.db_session.execute(
+                text(
+                    """
+                    UPDATE bill_text_manifest SET
+                        parser_version = :parser_version,
+                        json_bytes = :json_bytes,
+                        txt_bytes = :txt_bytes,
+                        processed_at = NOW()
+                    WHERE hash = :hash
+                """
+                ),
+                {
+                    "hash": file_hash,
+                    "parser_version": PARSER_VERSION,
+                    "json_bytes": sizes.get("json"),
+                    "txt_bytes": sizes.get("txt"),
+                },
+            )
+            self.db_session.commit()
+        except Exception:
+            self.db_session.rollback()
+            raise
+
+    def _upsert_manifest(self, rows_sql: str, params: Dict):
+        self.db_session.execute(
+            text(
+                f"""
+                INSERT INTO bill_text_manifest
+                    (hash, status, parser_version, pdf_bytes, json_bytes, txt_bytes)
+                {rows_sql}
+                ON CONFLICT (hash) DO UPDATE SET
+                    status = EXCLUDED.status,
+                    parser_version = EXCLUDED.parser_version,
+                    pdf_bytes = EXCLUDED.pdf_bytes,
+                    json_bytes = EXCLUDED.json_bytes,
+                    txt_bytes = EXCLUDED.txt_bytes,
+                    processed_at = NOW()
+            """
+            ),
+            params,
         )
 
-        plain_text = structured_text.get_plain_text()
-        self.storage_client.upload_file(
-            bucket=self.bucket_name,
-            key=f"{file_hash}.txt",
-            file_obj=plain_text.encode("utf-8"),
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception(_is_transient),
+        reraise=True,
+    )
+    def _conditional_get(self, url: str, source: Optional[TextSource]) -> requests.Response:
+        headers = {}
+        if source and source.etag:
+            headers["If-None-Match"] = source.etag
+        if source and source.last_modified:
+            headers["If-Modified-Since"] = source.last_modified
+
+        # Streamed, so the body can be spooled to disk by _read_body rather than buffered whole
+        response = self.session.get(url, headers=headers, timeout=30, stream=True)
+        if response.status_code != 304 and not response.ok:
+            response.close()
+            response.raise_for_status()
+        return response
+
+    def _read_body(self, response: requests.Response) -> Tuple[Optional[bytes], Optional[str], str]:
+        """Read a response body, spooling it to a temp file once it exceeds SPOOL_THRESHOLD
+
+        Returns the content or the spool file's path, and the body's sha256
+        """
+        digest = hashlib.sha256()
+        chunks = []
+        buffered = 0
+        spool_file = None
+        try:
+            with response:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    digest.update(chunk)
+                    if spool_file is not None:
+                        spool_file.write(chunk)
+                        continue
+                    chunks.append(chunk)
+                    buffered += len(chunk)
+                    if buffered > self.SPOOL_THRESHOLD:
+                        spool_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+                        spool_file.writelines(chunks)
+                        chunks = []
+        except BaseException:
+            if spool_file is not None:
+                spool_file.close()
+                os.unlink(spool_file.name)
+            raise
+
+        if spool_file is None:
+            return b"".join(chunks), None, digest.hexdigest()
+        spool_file.close()
+        return None, spool_file.name, digest.hexdigest()
+
+    def fetch_pdf(self, url_hash: str, url: str) -> DownloadedPDF:
+        """Download a PDF unless the server or its content hash shows it is already processed
+
+        PDFs whose bytes match another URL's processed PDF reuse that URL's stored results
+        """
+        source = self.text_sources.get(url_hash)
+        response = self._conditional_get(url, source)
+        if response.status_code == 304:
+            # The body is never read, so hand the streamed connection back to the pool here
+            response.close()
+            return DownloadedPDF(
+                url_hash=url_hash,
+                url=url,
+                status=DownloadStatus.NOT_MODIFIED,
+                etag=source.etag,
+                last_modified=source.last_modified,
+                content_hash=source.content_hash,
+            )
+
+        content, path, content_hash = self._read_body(response)
+        pdf = DownloadedPDF(
+            url_hash=url_hash,
+            url=url,
+            content=content,
+            path=path,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_hash=content_hash,
         )
 
+        if source and source.content_hash == pdf.content_hash:
+            pdf.status = DownloadStatus.UNCHANGED
+            pdf.release()
+            return pdf
+
+        duplicate_of = self.content_index.get(pdf.content_hash)
+        if duplicate_of and duplicate_of != url_hash:
+            self.copy_results(duplicate_of, url_hash)
+            logger.info(f"Reused results of {duplicate_of} for identical PDF at {url}")
+            pdf.status = DownloadStatus.COPIED
+            pdf.copied_from = duplicate_of
+            pdf.release()
+
+        return pdf
+
+    def copy_results(self, source_hash: str, file_hash: str):
+        for extension in self.RESULT_EXTENSIONS:
+            self.storage_client.copy_file(
+                bucket=self.bucket_name,
+                source_key=f"{source_hash}.{extension}",
+                key=f"{file_hash}.{extension}",
+            )
+
+    def save_pdf(self, pdf: Union[bytes, str], file_hash: str) -> int:
+        """Store a PDF, given as bytes or the path of a spooled file, in object storage"""
+        if isinstance(pdf, bytes):
+            self.storage_client.upload_file(
+                bucket=self.bucket_name,
+                key=f"{file_hash}.pdf",
+                file_obj=pdf,
+            )
+            return len(pdf)
+
+        with open(pdf, "rb") as pdf_file:
+            self.storage_client.upload_stream(
+                bucket=self.bucket_name, key=f"{file_hash}.pdf", data=pdf_file
+            )
+        return os.path.getsize(pdf)
+
+    def save_text_results(
+        self, structured_text: StructuredBillText, file_hash: str
+    ) -> Dict[str, int]:
+        """Store extracted text in object storage, returning the stored size of each output"""
+        # The compact encoding also drops default fields (empty child lists, zero indents, missing
+        # positions), which StructuredBillText restores on load
+        renderers = [
+            (
+                "json",
+                lambda: structured_text.model_dump_json(exclude_defaults=self.compress_text),
+                "application/json",
+            ),
+            ("txt", structured_text.get_plain_text, "text/plain; charset=utf-8"),
+        ]
+
+        sizes = {}
+        # Render one output at a time so only one serialized copy is alive at once
+        for extension, render, content_type in renderers:
+            content = render().encode("utf-8")
+            if self.compress_text:
+                content = gzip.compress(content, mtime=0)
+            self.storage_client.upload_file(
+                bucket=self.bucket_name,
+                key=f"{file_hash}.{extension}",
+                file_obj=content,
+                content_type=content_type,
+                content_encoding=GZIP if self.compress_text else None,
+            )
+            sizes[extension] = len(content)
+        return sizes
+
     def process_bill(self, url_hash: str, url: str):
         logger.info(f"Processing bill text for url {url}")
+        self.process_pdf(url_hash, url, self.download_pdf(url))
 
-        pdf_bytes = self.download_pdf(url)
-
-        self.save_pdf(pdf_bytes, url_hash)
+    def process_pdf(self, url_hash: str, url: str, pdf: Union[bytes, str]) -> Dict[str, int]:
+        """Store and parse a PDF (bytes or a spool file path), returning each stored output's size"""
+        sizes = {"pdf": self.save_pdf(pdf, url_hash)}
         logger.info(f"Saved PDF for url {url} as {url_hash}.pdf")
 
-        parser = BillPDFParser(io.BytesIO(pdf_bytes))
-        structured_text = parser.parse()
-
-        self.save_text_results(structured_text, url_hash)
+        sizes.update(self.parse_and_save(pdf, url_hash))
         logger.info(f"Saved bill text for url {url} as {url_hash}")
+        return sizes
+
+    def reparse_stored_pdf(self, file_hash: str) -> Dict[str, int]:
+        """Re-run the parser on an already stored PDF, overwriting its text outputs"""
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+            self.storage_client.download_stream(
+                bucket=self.bucket_name, key=f"{file_hash}.pdf", file_obj=pdf_file
+            )
+            pdf_file.flush()
+            return self.parse_and_save(pdf_file.name, file_hash)
+
+    def parse_and_save(self, pdf: Union[bytes, str], file_hash: str) -> Dict[str, int]:
+        # Stream pages through the parser so layouts aren't retained for the whole document
+        source = io.BytesIO(pdf) if isinstance(pdf, bytes) else pdf
+        parser = BillPDFParser(source, stream=True)
+        return self.save_text_results(parser.parse(), file_hash)
+
+
+# Per-process extractor for pool workers, created once by the pool initializer
+_worker_extractor: Optional[BillTextExtractor] = None
+
+
+def _init_worker(bucket_name: str, compress_text: bool):
+    global _worker_extractor
+    _worker_extractor = BillTextExtractor(
+        storage_client=S3Client(),
+        db_session=None,
+        bucket_name=bucket_name,
+        compress_text=compress_text,
+    )
+
+
+def _process_pdf_in_worker(url_hash: str, url: str, pdf: Union[bytes, str], timeout_seconds: int):
+    # Pool tasks run on the worker's main thread, so the soft SIGALRM timeout works here
+    with timeout(timeout_seconds):
+        return _worker_extractor.process_pdf(url_hash, url, pdf)
+
+
+def _reparse_in_worker(file_hash: str, timeout_seconds: int) -> Dict[str, int]:
+    with timeout(timeout_seconds):
+        return _worker_extractor.reparse_stored_pdf(file_hash)
+
+
+def _report_pid_and_init(worker_pids, initializer: Callable, *initargs):
+    worker_pids.append(os.getpid())
+    initializer(*initargs)
+
+
+class _WorkerPool(ProcessPoolExecutor):
+    """Process pool that can kill its workers, e.g. one stuck in native code past its deadline
+
+    shutdown() never stops a busy worker, so each worker reports its PID through a Manager list
+    as it starts, and terminate() signals only those processes rather than every child of this one
+    """
+
+    def __init__(
+        self, max_workers: int, initializer: Callable, initargs: tuple, max_tasks_per_child: int
+    ):
+        context = multiprocessing.get_context("spawn")
+        self._manager = context.Manager()
+        self._worker_pids = self._manager.list()
+        super().__init__(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_report_pid_and_init,
+            initargs=(self._worker_pids, initializer, *initargs),
+            max_tasks_per_child=max_tasks_per_child,
+        )
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+        if wait:
+            self._manager.shutdown()
+
+    def terminate(self):
+        """Shut down without waiting for running tasks, killing the workers running them"""
+        worker_pids = set(self._worker_pids)
+        workers = [child for child in multiprocessing.active_children() if child.pid in worker_pids]
+        self.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+        self._manager.shutdown()
+
+
+def _run_in_pool(
+    next_task: Callable[[bool], Optional[T]],
+    exhausted: Callable[[], bool],
+    submit: Callable[[_WorkerPool, T], Optional[Future]],
+    describe: Callable[[T], str],
+    bucket_name: str,
+    max_workers: int,
+    timeout_seconds: int,
+    max_tasks_per_child: int,
+    compress_text: bool,
+    grace_seconds: int,
+    poll_seconds: float,
+    max_crash_retries: int,
+) -> Iterator[Tuple[T, Optional[Dict[str, int]], Optional[BaseException]]]:
+    """Run tasks across worker processes under hard deadlines, yielding (task, result, error)
+
+    `next_task(block)` returns the next task, or None if there is none yet (or, when blocking,
+    none left). Tasks `submit` returns no future for are passed straight through as (task, None,
+    None). `describe` names a task in logs and must be unique per task.
+
+    Each task gets a soft SIGALRM timeout inside its worker. If a worker is still busy
+    `grace_seconds` after that (e.g. stuck in native code), the pool is torn down, the overdue
+    task is reported as timed out and the other in-flight tasks are retried on a fresh pool.
+    A worker crash breaks the whole pool, so every task in flight is retried too, and is only
+    reported as failed once it has been caught in more than `max_crash_retries` crashes.
+    Workers are recycled after `max_tasks_per_child` tasks to bound pdfminer memory growth.
+    """
+    retries: deque[T] = deque()
+    crashes: Dict[str, int] = {}
+
+    while retries or not exhausted():
+        executor = _WorkerPool(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(bucket_name, compress_text),
+            max_tasks_per_child=max_tasks_per_child,
+        )
+        # Only keep max_workers tasks in flight so each deadline starts close to when its task does
+        running: Dict[Future, Tuple[T, float]] = {}
+        pool_healthy = True
+        try:
+            while pool_healthy:
+                while len(running) < max_workers:
+                    # Wait for a task only when there is nothing to supervise
+                    task = retries.popleft() if retries else next_task(not running)
+                    if task is None:
+                        break
+                    try:
+                        future = submit(executor, task)
+                    except BrokenProcessPool:
+                        retries.appendleft(task)
+                        pool_healthy = False
+                        break
+                    if future is None:
+                        yield task, None, None
+                        continue
+                    running[future] = (task, time.monotonic() + timeout_seconds + grace_seconds)
+                if not running:
+                    break
+
+                next_deadline = min(deadline for _, deadline in running.values())
+                done, _ = wait(
+                    running,
+                    timeout=min(poll_seconds, max(0, next_deadline - time.monotonic())),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    task, _ = running.pop(future)
+                    error = future.exception()
+                    if isinstance(error, BrokenProcessPool):
+                        pool_healthy = False
+                        # Any in-flight task fails this way, not just the one that crashed
+                        name = describe(task)
+                        crashes[name] = crashes.get(name, 0) + 1
+                        if crashes[name] <= max_crash_retries:
+                            logger.warning(f"Worker pool broke while processing {name}; retrying")
+                            retries.append(task)
+                            continue
+                    yield task, None if error else future.result(), error
+
+                now = time.monotonic()
+                overdue = [future for future, (_, deadline) in running.items() if deadline <= now]
+                for future in overdue:
+                    task, _ = running.pop(future)
+                    logger.error(
+                        f"Worker exceeded hard deadline processing {describe(task)}; "
+                        "restarting pool"
+                    )
+                    yield task, None, TimeoutException("Exceeded hard deadline")
+                    pool_healthy = False
+        finally:
+            if pool_healthy:
+                executor.shutdown(wait=True)
+            else:
+                # Tasks that were in flight when the pool went down are retried on the next pool
+                retries.extendleft(reversed([task for task, _ in running.values()]))
+                executor.terminate()
+
+
+def process_bills_in_pool(
+    downloader: PDFDownloader,
+    bucket_name: str,
+    max_workers: int,
+    timeout_seconds: int = 60,
+    max_tasks_per_child: int = 20,
+    compress_text: bool = False,
+    grace_seconds: int = 15,
+    poll_seconds: float = 0.5,
+    max_crash_retries: int = 2,
+) -> Iterator[Tuple[DownloadedPDF, Optional[BaseException]]]:
+    """Parse PDFs from the downloader across worker processes, yielding (pdf, error)
+
+    PDFs that failed to download or don't need parsing are passed straight through. Timeouts,
+    crashes and worker recycling are handled as described in `_run_in_pool`.
+    """
+
+    def submit(executor: _WorkerPool, pdf: DownloadedPDF) -> Optional[Future]:
+        if not pdf.needs_processing:
+            return None
+        return executor.submit(
+            _process_pdf_in_worker,
+            pdf.url_hash,
+            pdf.url,
+            # Spooled PDFs cross to the worker as a path rather than their bytes
+            pdf.source,
+            timeout_seconds,
+        )
+
+    outcomes = _run_in_pool(
+        next_task=lambda block: downloader.get(timeout=None if block else 0),
+        exhausted=lambda: downloader.exhausted,
+        submit=submit,
+        describe=lambda pdf: pdf.url,
+        bucket_name=bucket_name,
+        max_workers=max_workers,
+        timeout_seconds=timeout_seconds,
+        max_tasks_per_child=max_tasks_per_child,
+        compress_text=compress_text,
+        grace_seconds=grace_seconds,
+        poll_seconds=poll_seconds,
+        max_crash_retries=max_crash_retries,
+    )
+    for pdf, output_sizes, error in outcomes:
+        if not pdf.needs_processing:
+            yield pdf, pdf.error
+            continue
+        if error is None:
+            pdf.output_sizes = output_sizes
+        yield pdf, error
+
+
+def reparse_in_pool(
+    file_hashes: List[str],
+    bucket_name: str,
+    max_workers: int,
+    timeout_seconds: int = 60,
+    max_tasks_per_child: int = 20,
+    compress_text: bool = False,
+    grace_seconds: int = 15,
+    poll_seconds: float = 0.5,
+    max_crash_retries: int = 2,
+) -> Iterator[Tuple[str, Optional[Dict[str, int]], Optional[BaseException]]]:
+    """Re-parse stored PDFs across worker processes, yielding (hash, output sizes, error)
+
+    Workers read the PDF from the bucket themselves, so nothing is downloaded from the source sites
+    and only hashes cross the process boundary. Results are yielded in completion order, and
+    timeouts, crashes and worker recycling are handled as described in `_run_in_pool`.
+    """
+    remaining = deque(file_hashes)
+    return _run_in_pool(
+        next_task=lambda block: remaining.popleft() if remaining else None,
+        exhausted=lambda: not remaining,
+        submit=lambda executor, file_hash: executor.submit(
+            _reparse_in_worker, file_hash, timeout_seconds
+        ),
+        describe=lambda file_hash: file_hash,
+        bucket_name=bucket_name,
+        max_workers=max_workers,
+        timeout_seconds=timeout_seconds,
+        max_tasks_per_child=max_tasks_per_child,
+        compress_text=compress_text,
+        grace_seconds=grace_seconds,
+        poll_seconds=poll_seconds,
+        max_crash_retries=max_crash_retries,
+    )
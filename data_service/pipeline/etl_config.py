@@ -1,8 +1,10 @@
 import hashlib
+import io
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import time
 
 import pandas as pd
@@ -102,6 +104,11 @@ class Transformation(BaseModel):
             raise
 
 
+class LoadMethod(str, Enum):
+    TO_SQL = "to_sql"
+    COPY = "copy"
+
+
 class JoinType(str, Enum):
     LEFT = "LEFT JOIN"
     RIGHT = "RIGHT JOIN"
@@ -162,6 +169,19 @@ def process_single_legislator(legislator_data: Dict) -> Tuple[bool, Dict]:
         return False, error_data
 
 
+class LoadStats(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __add__(self, other: "LoadStats") -> "LoadStats":
+        return LoadStats(
+            inserted=self.inserted + other.inserted,
+            updated=self.updated + other.updated,
+            unchanged=self.unchanged + other.unchanged,
+        )
+
+
 class ETLConfig(BaseModel):
     source: str
     source_columns: Set[str]
@@ -170,19 +190,31 @@ class ETLConfig(BaseModel):
     join_config: Optional[JoinConfig] = None
     transformations: List[Transformation]
     unique_constraints: List[str] = Field(default=["id"])
+    watermark_column: Optional[str] = None
+    high_water_mark: Optional[datetime] = None
     dataframe: Optional[pd.DataFrame] = None
     pds_load: bool = False
+    load_method: LoadMethod = LoadMethod.TO_SQL
+    depends_on: List[str] = Field(default_factory=list)
+    load_stats: LoadStats = Field(default_factory=LoadStats)
     max_workers: int = Field(default=50)
     batch_size: int = Field(default=100)
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
     _user_service_client: UserServiceClient = None
 
-    def _get_source_query(self, join_config: Optional[JoinConfig]) -> str:
-        """Generate SQL query for source data extraction"""
+    def _get_source_alias(self) -> str:
         # Check if source is a subquery by looking for ') AS' pattern
+        if ") AS " in self.source:
+            return self.source.split(" AS ")[-1].strip()
+        return self.source
+
+    def _get_source_query(
+        self, join_config: Optional[JoinConfig], since: Optional[datetime] = None
+    ) -> str:
+        """Generate SQL query for source data extraction"""
         is_subquery = ") AS " in self.source
-        source_alias = self.source.split(" AS ")[-1].strip() if is_subquery else self.source
+        source_alias = self._get_source_alias()
 
         if join_config:
             join_config._query_validation(source_columns=self.source_columns)
@@ -197,17 +229,63 @@ class ETLConfig(BaseModel):
                 columns = ", ".join(sorted(self.source_columns))
             source_query = f"SELECT {columns} FROM {self.source}"
 
+        # Inclusive, since rows committed after the mark was captured can share its timestamp;
+        # re-extracting the rows stamped exactly at the mark is harmless with the upsert
+        if since is not None and self.watermark_column:
+            source_query += f" WHERE {self._get_watermark_expression()} >= :since"
+
         return source_query
 
-    def extract(self, conn: Session):
-        query = self._get_source_query(join_config=self.join_config)
+    def _get_watermark_expression(self) -> str:
+        """Qualified watermark column, either on the source or on a joined table"""
+        if "." in self.watermark_column:
+            return self.watermark_column
+        return f"{self._get_source_alias()}.{self.watermark_column}"
+
+    def _get_watermark_query(self) -> str:
+        if "." in self.watermark_column:
+            table = self.watermark_column.split(".")[0]
+            return f"SELECT MAX({self.watermark_column}) FROM {table}"
+        return f"SELECT MAX({self._get_watermark_expression()}) FROM {self.source}"
+
+    def _capture_high_water_mark(self, conn: Session, since: Optional[datetime]) -> None:
+        if not self.watermark_column:
+            return
+
+        # Capture the mark before reading so rows changed mid-extract are picked up next run
+        self.high_water_mark = conn.execute(text(self._get_watermark_query())).scalar()
+        if since is not None:
+            logger.info(f"Extracting {self.source} rows changed since {since}")
+
+    def extract(self, conn: Session, since: Optional[datetime] = None):
+        """Extract source rows, limited to rows changed after `since` when a watermark is set"""
+        query = self._get_source_query(join_config=self.join_config, since=since)
         logger.info(query)
         try:
-            self.dataframe = pd.read_sql(query, con=conn)
+            self._capture_high_water_mark(conn, since)
+            params = {"since": since} if since is not None else None
+            self.dataframe = pd.read_sql(text(query), con=conn, params=params)
         except Exception as e:
             logger.error(f"Error reading data with query '{query}': {e}")
             raise
 
+    def extract_chunks(
+        self, conn: Session, chunk_size: int, since: Optional[datetime] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Stream source rows through a server-side cursor, chunk_size rows at a time"""
+        query = self._get_source_query(join_config=self.join_config, since=since)
+        logger.info(f"{query} (streaming in chunks of {chunk_size})")
+        try:
+            self._capture_high_water_mark(conn, since)
+            params = {"since": since} if since is not None else None
+            statement = text(query).execution_options(
+                stream_results=True, max_row_buffer=chunk_size
+            )
+            yield from pd.read_sql(statement, con=conn, params=params, chunksize=chunk_size)
+        except Exception as e:
+            logger.error(f"Error streaming data with query '{query}': {e}")
+            raise
+
     def transform(self) -> None:
         """Apply all transformations to the dataframe"""
         if self.dataframe is None:
@@ -362,44 +440,150 @@ class ETLConfig(BaseModel):
             if not exists:
                 raise ValueError(f"Destination table '{self.destination}' does not exist")
 
-            # Create temporary table
-            temp_table = f"temp_{self.destination}"
-            self.dataframe[self.destination_columns].to_sql(
-                temp_table,
-                con=conn,
-                if_exists="replace",
-                index=False,
-            )
+            match self.load_method:
+                case LoadMethod.COPY:
+                    temp_table = self._copy_to_temp_table(conn)
+                case _:
+                    temp_table = self._write_temp_table(conn)
 
-            # Perform UPSERT from temporary table
+            # Perform UPSERT from temporary table, skipping rows whose values are unchanged
+            columns = ", ".join(self.destination_columns)
             conflict_targets = ", ".join(self.unique_constraints)
-            update_sets = ", ".join(
-                f"{col} = EXCLUDED.{col}"
-                for col in self.destination_columns
-                if col not in self.unique_constraints
-            )
+            update_columns = [
+                col for col in self.destination_columns if col not in self.unique_constraints
+            ]
 
-            # Special case where all columns are part of unique constraint
-            if not update_sets:
-                update_sets = "id = EXCLUDED.id"  # Dummy update that won't actually happen
+            if update_columns:
+                update_sets = ", ".join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+                current_values = ", ".join(f"target.{col}" for col in update_columns)
+                new_values = ", ".join(f"EXCLUDED.{col}" for col in update_columns)
+                conflict_action = f"""DO UPDATE SET {update_sets}
+                    WHERE ROW({current_values}) IS DISTINCT FROM ROW({new_values})"""
+            else:
+                # Every column is part of the unique constraint, so a conflict is always a no-op
+                conflict_action = "DO NOTHING"
 
+            # xmax is 0 only for freshly inserted tuples; unchanged rows are not returned at all
             upsert_query = f"""
-                INSERT INTO {self.destination} ({', '.join(self.destination_columns)})
-                SELECT {', '.join(self.destination_columns)}
-                FROM {temp_table}
-                ON CONFLICT ({conflict_targets})
-                DO UPDATE SET {update_sets}
+                WITH upserted AS (
+                    INSERT INTO {self.destination} AS target ({columns})
+                    SELECT {columns}
+                    FROM {temp_table}
+                    ON CONFLICT ({conflict_targets})
+                    {conflict_action}
+                    RETURNING (xmax = 0) AS inserted
+                )
+                SELECT
+                    COUNT(*) FILTER (WHERE inserted) AS inserted,
+                    COUNT(*) FILTER (WHERE NOT inserted) AS updated
+                FROM upserted
             """
             logger.info(f"Executing upsert query: {upsert_query}")
-            conn.execute(text(upsert_query))
-            conn.execute(text(f"DROP TABLE {temp_table}"))
+            inserted, updated = conn.execute(text(upsert_query)).one()
+            stats = LoadStats(
+                inserted=inserted,
+                updated=updated,
+                unchanged=len(self.dataframe) - inserted - updated,
+            )
+            if self.load_method == LoadMethod.TO_SQL:
+                conn.execute(text(f"DROP TABLE {temp_table}"))
             conn.commit()
 
+            self.load_stats += stats
+            logger.info(
+                f"Loaded {self.destination}: {stats.inserted} inserted, {stats.updated} updated, "
+                f"{stats.unchanged} unchanged"
+            )
+
         except Exception as e:
             logger.error(f"Error upserting data into '{self.destination}': {e}")
             conn.rollback()
             raise
 
+    def _write_temp_table(self, conn: Session) -> str:
+        """Stage the dataframe with DataFrame.to_sql (batched INSERTs)"""
+        temp_table = f"temp_{self.destination}"
+        self.dataframe[self.destination_columns].to_sql(
+            temp_table,
+            con=conn,
+            if_exists="replace",
+            index=False,
+        )
+        return temp_table
+
+    def _copy_to_temp_table(self, conn: Session) -> str:
+        """Stage the dataframe with COPY into a session-local table typed like the destination"""
+        temp_table = f"temp_{self.destination}"
+        columns = ", ".join(self.destination_columns)
+        conn.execute(
+            text(
+                f"""
+                CREATE TEMP TABLE {temp_table} ON COMMIT DROP AS
+                SELECT {columns} FROM {self.destination} WITH NO DATA
+            """
+            )
+        )
+
+        buffer = io.StringIO()
+        self._get_copy_dataframe(conn).to_csv(buffer, index=False, header=False, na_rep="\\N")
+        buffer.seek(0)
+
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {temp_table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer
+            )
+        finally:
+            cursor.close()
+
+        return temp_table
+
+    def _get_copy_dataframe(self, conn: Session) -> pd.DataFrame:
+        """Restore integer columns that pandas widened to float because of missing values"""
+        integer_columns = set(
+            conn.execute(
+                text(
+                    """
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_name = :table_name
+                    AND data_type IN ('smallint', 'integer', 'bigint')
+                """
+                ),
+                {"table_name": self.destination},
+            ).scalars()
+        )
+        df = self.dataframe[self.destination_columns]
+        widened = [
+            column
+            for column in df.select_dtypes(include="float").columns
+            if column in integer_columns
+        ]
+        return df.astype({column: "Int64" for column in widened})
+
+    def save_watermark(self, conn: Session):
+        """Persist the high-water mark captured during extraction after a successful load"""
+        if self.high_water_mark is None:
+            return
+
+        try:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO etl_watermarks (destination, high_water_mark)
+                    VALUES (:destination, :high_water_mark)
+                    ON CONFLICT (destination)
+                    DO UPDATE SET high_water_mark = EXCLUDED.high_water_mark, updated_at = NOW()
+                """
+                ),
+                {"destination": self.destination, "high_water_mark": self.high_water_mark},
+            )
+            conn.commit()
+            logger.info(f"Saved high-water mark {self.high_water_mark} for {self.destination}")
+        except Exception as e:
+            logger.error(f"Failed to save high-water mark for '{self.destination}': {e}")
+            conn.rollback()
+            raise
+
     def create_or_update_legislator(self, legislator_data: Dict) -> Dict:
         if not self._user_service_client:
             self._user_service_client = UserServiceClient()
@@ -0,0 +1,218 @@
+import logging
+import os
+import queue
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadStatus(str, Enum):
+    # New or changed content that needs parsing
+    DOWNLOADED = "downloaded"
+    # The server answered a conditional request with 304
+    NOT_MODIFIED = "not_modified"
+    # Re-downloaded, but the bytes hash to what was already processed for this URL
+    UNCHANGED = "unchanged"
+    # Same bytes as another URL's PDF, whose stored results were copied instead of re-parsing
+    COPIED = "copied"
+
+
+@dataclass
+class DownloadedPDF:
+    url_hash: str
+    url: str
+    content: Optional[bytes] = None
+    # Large PDFs are spooled to this temp file instead of being held in `content`
+    path: Optional[str] = None
+    error: Optional[BaseException] = None
+    status: DownloadStatus = DownloadStatus.DOWNLOADED
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    # url_hash whose stored results were reused for a COPIED PDF
+    copied_from: Optional[str] = None
+    # Byte sizes of the stored outputs, keyed by extension, once processed
+    output_sizes: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def needs_processing(self) -> bool:
+        return self.error is None and self.status == DownloadStatus.DOWNLOADED
+
+    @property
+    def source(self) -> Union[bytes, str, None]:
+        """The PDF's bytes, or the path of the file they were spooled to"""
+        return self.content if self.content is not None else self.path
+
+    def release(self):
+        """Drop the downloaded PDF, deleting its spool file if it has one"""
+        self.content = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+class PDFDownloader:
+    """Download PDFs on a thread pool into a bounded queue for the parse stage to consume
+
+    Downloads start as soon as `start` is called and overlap with parsing. At most
+    `per_host_limit` requests hit the same host at once, and workers block once `queue_size`
+    downloaded PDFs are waiting to be parsed, which bounds memory use.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self,
+        download: Callable[[str, str], DownloadedPDF],
+        max_workers: int = 16,
+        per_host_limit: int = 4,
+        queue_size: int = 32,
+    ):
+        self.download = download
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.exhausted = False
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        # Requests running per host, and downloads not yet handed to the queue, both guarded by
+        # _slot_freed
+        self._host_active: Dict[str, int] = defaultdict(int)
+        self._in_flight = 0
+        self._slot_freed = threading.Condition()
+        self._stopped = threading.Event()
+
+    @staticmethod
+    def interleave_by_host(bills: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Round-robin bills across hosts so one slow site doesn't occupy every worker"""
+        by_host: Dict[str, deque] = defaultdict(deque)
+        for url_hash, url in bills:
+            by_host[urlparse(url).netloc].append((url_hash, url))
+
+        ordered = []
+        hosts = deque(by_host.values())
+        while hosts:
+            host_bills = hosts.popleft()
+            ordered.append(host_bills.popleft())
+            if host_bills:
+                hosts.append(host_bills)
+        return ordered
+
+    def start(self, bills: List[Tuple[str, str]]):
+        threading.Thread(
+            target=self._run, args=(self.interleave_by_host(bills),), daemon=True
+        ).start()
+
+    def stop(self):
+        """Abandon pending downloads, e.g. when the consumer bails out early"""
+        self._stopped.set()
+        with self._slot_freed:
+            self._slot_freed.notify_all()
+        self._release_queued()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[DownloadedPDF]:
+        """Next downloaded PDF, or None if none arrived within `timeout` or all have been consumed"""
+        if self.exhausted:
+            return None
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if item is self._DONE:
+            self.exhausted = True
+            return None
+        return item
+
+    def __iter__(self) -> Iterator[DownloadedPDF]:
+        while (item := self.get()) is not None:
+            yield item
+
+    def _run(self, bills: List[Tuple[str, str]]):
+        pending = deque(bills)
+        # Bills passed over while their host was at per_host_limit, in their original order
+        deferred: Dict[str, deque] = defaultdict(deque)
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix="pdf-download") as executor:
+            while (bill := self._claim_next(pending, deferred)) is not None:
+                executor.submit(self._download, *bill)
+        self._put(self._DONE)
+
+    def _claim_next(self, pending: deque, deferred: Dict[str, deque]) -> Optional[Tuple[str, str]]:
+        """Wait for a free worker, then claim the next bill whose host has a free slot
+
+        Waiting for host slots here rather than in the pool threads keeps a slow host from tying
+        up workers that other hosts' downloads could use. Returns None once every bill has been
+        claimed or the downloader is stopped.
+        """
+        with self._slot_freed:
+            while not self._stopped.is_set():
+                if self._in_flight < self.max_workers:
+                    bill = self._take_ready(pending, deferred)
+                    if bill is not None:
+                        self._host_active[urlparse(bill[1]).netloc] += 1
+                        self._in_flight += 1
+                        return bill
+                    if not pending and not any(deferred.values()):
+                        return None
+                self._slot_freed.wait()
+            return None
+
+    def _take_ready(self, pending: deque, deferred: Dict[str, deque]) -> Optional[Tuple[str, str]]:
+        for host, host_bills in deferred.items():
+            if host_bills and self._host_active[host] < self.per_host_limit:
+                return host_bills.popleft()
+        while pending:
+            url_hash, url = pending.popleft()
+            host = urlparse(url).netloc
+            if self._host_active[host] < self.per_host_limit:
+                return url_hash, url
+            deferred[host].append((url_hash, url))
+        return None
+
+    def _download(self, url_hash: str, url: str):
+        host = urlparse(url).netloc
+        try:
+            try:
+                result = self.download(url_hash, url)
+            except Exception as e:
+                logger.error(f"Failed to download {url}: {e}")
+                result = DownloadedPDF(url_hash=url_hash, url=url, error=e)
+            finally:
+                # The host is free for another request while this result waits for the queue
+                with self._slot_freed:
+                    self._host_active[host] -= 1
+                    self._slot_freed.notify_all()
+            self._put(result)
+        finally:
+            with self._slot_freed:
+                self._in_flight -= 1
+                self._slot_freed.notify_all()
+
+    def _put(self, item):
+        # Poll so producers blocked on a full queue notice when the consumer stops
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=1)
+            except queue.Full:
+                continue
+            # A put blocked on the full queue can land right after stop() has emptied it
+            if self._stopped.is_set():
+                self._release_queued()
+            return
+        if isinstance(item, DownloadedPDF):
+            item.release()
+
+    def _release_queued(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, DownloadedPDF):
+                item.release()
@@ -1,23 +1,47 @@
+import argparse
 import logging
 import json
 import os
 import gc
-import signal
 from contextlib import contextmanager
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Dict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from common.database.referendum import connection as referendum_connection
+from common.database.referendum import reference_data
 from common.database.legiscan_api import connection as legiscan_api_connection
+from common.database.referendum.views import (
+    MaterializedView,
+    refresh_view_if_dirty,
+    suspend_view_refresh,
+)
 from common.aws.s3.client import S3Client
-from pipeline.bill_text_extraction import BillTextExtractor
+from pipeline.bill_text_extraction import (
+    BillTextExtractor,
+    TimeoutException,
+    process_bills_in_pool,
+    reparse_in_pool,
+    timeout,
+)
+from pipeline.pdf_downloader import DownloadedPDF, DownloadStatus, PDFDownloader
 from pipeline.etl_config import ETLConfig
+from pipeline.scheduler import run_dag
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 BILL_TEXT_BUCKET_NAME = os.getenv("BILL_TEXT_BUCKET_NAME")
+ETL_CHUNK_SIZE = int(os.getenv("ETL_CHUNK_SIZE", 0)) or None
+ETL_WORKERS = int(os.getenv("ETL_WORKERS", 4))
+TEXT_EXTRACTION_WORKERS = int(os.getenv("TEXT_EXTRACTION_WORKERS", os.cpu_count() or 1))
+TEXT_EXTRACTION_TIMEOUT = int(os.getenv("TEXT_EXTRACTION_TIMEOUT", 60))
+TEXT_EXTRACTION_MAX_TASKS_PER_CHILD = int(os.getenv("TEXT_EXTRACTION_MAX_TASKS_PER_CHILD", 20))
+TEXT_EXTRACTION_REFRESH = os.getenv("TEXT_EXTRACTION_REFRESH", "false").lower() == "true"
+TEXT_EXTRACTION_COMPRESS = os.getenv("TEXT_EXTRACTION_COMPRESS", "false").lower() == "true"
+TEXT_DOWNLOAD_WORKERS = int(os.getenv("TEXT_DOWNLOAD_WORKERS", 16))
+TEXT_DOWNLOAD_PER_HOST_LIMIT = int(os.getenv("TEXT_DOWNLOAD_PER_HOST_LIMIT", 4))
 
 
 def get_legiscan_api_db():
@@ -55,28 +79,48 @@ def check_db_connection(db_session):
         raise
 
 
-def extract_all(etl_configs: List[ETLConfig]):
-    legiscan_db = next(get_legiscan_api_db())
-
-    with legiscan_db.connection() as conn:
-        for config in etl_configs:
-            config.extract(conn)
-
-
-def transform_all(etl_configs: List[ETLConfig]):
-    for config in etl_configs:
-        config.transform()
-
-
-def load_all(etl_configs: List[ETLConfig]):
+def get_watermarks() -> Dict[str, datetime]:
+    """Get the high-water mark of the last successful load for each destination"""
     referendum_db = next(get_referendum_db())
 
     with referendum_db.connection() as conn:
-        for config in etl_configs:
-            config.load(conn)
-
-
-def run_etl():
+        result = conn.execute(text("SELECT destination, high_water_mark FROM etl_watermarks"))
+        return {row[0]: row[1] for row in result}
+
+
+def run_etl_unit(config: ETLConfig, since: Optional[datetime], chunk_size: Optional[int]):
+    """Extract, transform and load a single config on its own pooled connections
+
+    With a chunk_size, the config is streamed chunk by chunk to bound peak memory
+    """
+    with (
+        contextmanager(get_legiscan_api_db)() as legiscan_db,
+        contextmanager(get_referendum_db)() as referendum_db,
+    ):
+        with legiscan_db.connection() as source_conn, referendum_db.connection() as conn:
+            if chunk_size:
+                chunks = config.extract_chunks(source_conn, chunk_size=chunk_size, since=since)
+                for chunk_num, chunk in enumerate(chunks, start=1):
+                    logger.info(
+                        f"Processing chunk {chunk_num} ({len(chunk)} rows) of {config.source}"
+                    )
+                    config.dataframe = chunk
+                    config.transform()
+                    config.load(conn)
+            else:
+                config.extract(source_conn, since=since)
+                config.transform()
+                config.load(conn)
+
+            config.dataframe = None
+            config.save_watermark(conn)
+
+
+def run_etl(
+    full: bool = False,
+    chunk_size: Optional[int] = ETL_CHUNK_SIZE,
+    max_workers: int = ETL_WORKERS,
+):
     directory = os.path.dirname(os.path.abspath(__file__))
     config_filepath = f"{directory}/legiscan_etl_configs.json"
 
@@ -85,105 +129,268 @@ def run_etl():
         etl_configs = [ETLConfig(**config) for config in config_data]
 
     try:
-        logger.info("Beginning extraction")
-        extract_all(etl_configs)
-        logger.info("Beginning transformation")
-        transform_all(etl_configs)
-        logger.info("Beginning load")
-        load_all(etl_configs)
+        watermarks = {} if full else get_watermarks()
+        logger.info(
+            f"Beginning {'full' if full else 'incremental'} ETL with {max_workers} workers"
+            + (f", streaming in chunks of {chunk_size} rows" if chunk_size else "")
+        )
+        # Refresh the materialized views once after every unit has loaded, not per upsert
+        referendum_db = next(get_referendum_db())
+        try:
+            with (
+                suspend_view_refresh(referendum_db, MaterializedView.VOTE_COUNTS_BY_PARTY),
+                suspend_view_refresh(referendum_db, MaterializedView.BILL_CATALOG),
+            ):
+                try:
+                    run_dag(
+                        etl_configs,
+                        lambda config: run_etl_unit(
+                            config, watermarks.get(config.destination), chunk_size
+                        ),
+                        max_workers=max_workers,
+                    )
+                finally:
+                    # Even a partial load may have changed states, sessions and the other lookups
+                    reference_data.bump_generation(referendum_db)
+        finally:
+            referendum_db.close()
+        for config in etl_configs:
+            stats = config.load_stats
+            logger.info(
+                f"{config.destination}: {stats.inserted} inserted, {stats.updated} updated, "
+                f"{stats.unchanged} unchanged"
+            )
         logger.info("ETL process completed successfully")
     except ConnectionError as e:
         logger.error(f"ETL process failed: {str(e)}")
+        raise
     except Exception as e:
+        # Includes the SchedulerError for failed units, so the run exits non-zero
         logger.error(f"ETL process failed with unexpected error: {str(e)}")
+        raise
 
 
-# TODO - move this to shared module
-class TimeoutException(Exception):
-    pass
-
-
-@contextmanager
-def timeout(seconds):
-    def handler(signum, frame):
-        raise TimeoutException("Timed out")
-
-    signal.signal(signal.SIGALRM, handler)
-    signal.alarm(seconds)
-    try:
-        yield
-    finally:
-        signal.alarm(0)
-
-
-def run_text_extraction(batch_size=20):
+def process_bills_serially(
+    extractor: BillTextExtractor,
+    downloader: PDFDownloader,
+    timeout_seconds: int,
+    batch_size: int,
+) -> Iterator[Tuple[DownloadedPDF, Optional[BaseException]]]:
+    for completed, pdf in enumerate(downloader, start=1):
+        if not pdf.needs_processing:
+            yield pdf, pdf.error
+            continue
+
+        logger.info(f"Processing url for hash {pdf.url_hash}")
+        try:
+            with timeout(timeout_seconds):
+                pdf.output_sizes = extractor.process_pdf(pdf.url_hash, pdf.url, pdf.source)
+            yield pdf, None
+        except Exception as e:
+            yield pdf, e
+
+        if completed % batch_size == 0:
+            gc.collect()
+
+
+def run_text_extraction(
+    batch_size=20,
+    max_workers: int = TEXT_EXTRACTION_WORKERS,
+    download_workers: int = TEXT_DOWNLOAD_WORKERS,
+    timeout_seconds: int = TEXT_EXTRACTION_TIMEOUT,
+    max_tasks_per_child: int = TEXT_EXTRACTION_MAX_TASKS_PER_CHILD,
+    refresh: bool = TEXT_EXTRACTION_REFRESH,
+    compress_text: bool = TEXT_EXTRACTION_COMPRESS,
+):
+    """Download and parse every bill text missing from the bucket
+
+    PDFs are downloaded on a thread pool while earlier ones are parsed. With max_workers > 1 they
+    are parsed in a process pool; otherwise serially in this process. With refresh, stored bill
+    texts are also re-checked with conditional requests and re-parsed only if their content changed.
+    With compress_text, the text outputs are stored gzip-compressed
+    """
     storage_client = S3Client()
     referendum_db = next(get_referendum_db())
     extractor = BillTextExtractor(
-        storage_client=storage_client, db_session=referendum_db, bucket_name=BILL_TEXT_BUCKET_NAME
+        storage_client=storage_client,
+        db_session=referendum_db,
+        bucket_name=BILL_TEXT_BUCKET_NAME,
+        compress_text=compress_text,
     )
 
-    # Get bills to process
-    required_text_hash_map = extractor.get_required_bill_text_hash_map()
-    logger.info(f"Found {len(required_text_hash_map)} required bill texts in database")
-
-    # Get already processed bills
-    existing_hashes = extractor.get_stored_hashes()
-    logger.info(f"Found {len(existing_hashes)} existing bill texts")
+    backfilled = extractor.backfill_manifest()
+    if backfilled:
+        logger.info(f"Backfilled the bill text manifest with {backfilled} stored bill texts")
 
-    # Process missing bills
-    missing_text_hash_map = {
-        url_hash: url
-        for url_hash, url in required_text_hash_map.items()
-        if url_hash not in existing_hashes
-    }
+    missing_text_hash_map = extractor.get_unprocessed_bill_texts()
     logger.info(f"Processing {len(missing_text_hash_map)} missing bills")
+    deferred = extractor.get_deferred_failure_counts()
+    if any(deferred.values()):
+        logger.info(
+            f"Skipping {deferred['backing_off']} previously failed bills until their next attempt "
+            f"and {deferred['dead_letter']} dead-lettered bills"
+        )
+
+    work_items = list(missing_text_hash_map.items())
+    if refresh:
+        stored_items = list(extractor.get_processed_bill_texts().items())
+        logger.info(f"Re-checking {len(stored_items)} stored bills for changes")
+        work_items.extend(stored_items)
+
+    extractor.load_text_sources()
 
     succeeded = 0
+    skipped = 0
     failed = 0
+    dead_lettered = 0
     failed_urls: Dict[str, Dict] = {}
-    hash_map_items = list(missing_text_hash_map.items())
-    total_items = len(hash_map_items)
-    total_batches = (total_items + batch_size - 1) // batch_size
-    progress_interval = max(1, total_batches // 10)
-    logger.info(
-        f"Processing {total_items} missing bills across {total_batches} batches (batch_size={batch_size})"
+    total_items = len(work_items)
+    progress_interval = max(1, total_items // 10)
+
+    # Downloads run ahead of parsing on their own thread pool
+    downloader = PDFDownloader(
+        extractor.fetch_pdf,
+        max_workers=download_workers,
+        per_host_limit=TEXT_DOWNLOAD_PER_HOST_LIMIT,
+        queue_size=2 * max(max_workers, 1),
     )
-    for i in range(0, len(hash_map_items), batch_size):
-        batch = dict(hash_map_items[i : i + batch_size])
-        current_batch = i // batch_size + 1
-        logger.info(f"Processing batch {current_batch}/{total_batches}, size: {len(batch)}")
-        for url_hash, url in batch.items():
-            logger.info(f"Processing url for hash {url_hash}")
-            try:
-                with timeout(60):
-                    extractor.process_bill(url_hash, url)
+    downloader.start(work_items)
+
+    if max_workers > 1:
+        logger.info(
+            f"Processing {total_items} bills across {max_workers} worker processes "
+            f"(timeout={timeout_seconds}s, max_tasks_per_child={max_tasks_per_child})"
+        )
+        outcomes = process_bills_in_pool(
+            downloader,
+            bucket_name=BILL_TEXT_BUCKET_NAME,
+            max_workers=max_workers,
+            timeout_seconds=timeout_seconds,
+            max_tasks_per_child=max_tasks_per_child,
+            compress_text=compress_text,
+        )
+    else:
+        logger.info(f"Processing {total_items} bills (batch_size={batch_size})")
+        outcomes = process_bills_serially(extractor, downloader, timeout_seconds, batch_size)
+
+    try:
+        for completed, (pdf, error) in enumerate(outcomes, start=1):
+            url_hash, url = pdf.url_hash, pdf.url
+            if error is None:
+                extractor.record_result(pdf)
+                if pdf.status in (DownloadStatus.NOT_MODIFIED, DownloadStatus.UNCHANGED):
+                    skipped += 1
+                else:
                     succeeded += 1
-            except TimeoutException:
-                logger.error(f"Timeout processing URL: {url}")
-                failed_urls[url_hash] = {"url": url, "error": "Timeout"}
+            else:
+                if isinstance(error, TimeoutException):
+                    logger.error(f"Timeout processing URL: {url}")
+                    failed_urls[url_hash] = {"url": url, "error": "Timeout"}
+                else:
+                    logger.error(f"Failed to process URL: {url}, Error: {str(error)}")
+                    failed_urls[url_hash] = {"url": url, "error": str(error)}
                 failed += 1
-            except Exception as e:
-                logger.error(f"Failed to process URL: {url}, Error: {str(e)}")
-                failed_urls[url_hash] = {"url": url, "error": str(e)}
-                failed += 1
-
-        gc.collect()
-        if current_batch % progress_interval == 0:
-            logger.info(
-                f"Progress: {current_batch}/{total_batches} batches completed ({(current_batch / total_batches * 100):.1f}%)"
-            )
+                if extractor.record_failure(url_hash, url, error):
+                    logger.warning(f"Dead-lettered {url} after repeated or permanent failures")
+                    dead_lettered += 1
+            # Parsed or not, the downloaded PDF is no longer needed
+            pdf.release()
+
+            if completed % progress_interval == 0:
+                logger.info(
+                    f"Progress: {completed}/{total_items} bills completed ({(completed / total_items * 100):.1f}%)"
+                )
+    finally:
+        downloader.stop()
 
     logger.info(
         f"Text extraction completed. "
         f"Total Succeeded: {succeeded}, "
+        f"Total Unchanged: {skipped}, "
         f"Total Failed: {failed}, "
+        f"Newly Dead-Lettered: {dead_lettered}, "
         f"Failed PDFs: {failed_urls}"
     )
     if failed > 0:
         raise Exception(f"Text extraction had {failed} failures")
 
 
+def reparse_serially(
+    extractor: BillTextExtractor, file_hashes: List[str], timeout_seconds: int
+) -> Iterator[Tuple[str, Optional[Dict[str, int]], Optional[BaseException]]]:
+    for file_hash in file_hashes:
+        try:
+            # Yield only after the alarm is cleared, so it can't fire in the consumer's code
+            with timeout(timeout_seconds):
+                sizes = extractor.reparse_stored_pdf(file_hash)
+            yield file_hash, sizes, None
+        except Exception as e:
+            yield file_hash, None, e
+
+
+def run_reparse(
+    max_workers: int = TEXT_EXTRACTION_WORKERS,
+    timeout_seconds: int = TEXT_EXTRACTION_TIMEOUT,
+    max_tasks_per_child: int = TEXT_EXTRACTION_MAX_TASKS_PER_CHILD,
+    compress_text: bool = TEXT_EXTRACTION_COMPRESS,
+):
+    """Re-derive stored bill texts produced by an older parser version from their stored PDFs
+
+    Each result is stamped in the manifest as soon as it is saved, so an interrupted run picks up
+    where it left off
+    """
+    referendum_db = next(get_referendum_db())
+    extractor = BillTextExtractor(
+        storage_client=S3Client(),
+        db_session=referendum_db,
+        bucket_name=BILL_TEXT_BUCKET_NAME,
+        compress_text=compress_text,
+    )
+
+    backfilled = extractor.backfill_manifest()
+    if backfilled:
+        logger.info(f"Backfilled the bill text manifest with {backfilled} stored bill texts")
+
+    file_hashes = extractor.get_outdated_bill_texts()
+    total_items = len(file_hashes)
+    logger.info(f"Re-parsing {total_items} bill texts across {max_workers} worker processes")
+
+    if max_workers > 1:
+        outcomes = reparse_in_pool(
+            file_hashes,
+            bucket_name=BILL_TEXT_BUCKET_NAME,
+            max_workers=max_workers,
+            timeout_seconds=timeout_seconds,
+            max_tasks_per_child=max_tasks_per_child,
+            compress_text=compress_text,
+        )
+    else:
+        outcomes = reparse_serially(extractor, file_hashes, timeout_seconds)
+
+    succeeded = 0
+    failed_hashes: Dict[str, str] = {}
+    progress_interval = max(1, total_items // 10)
+    for completed, (file_hash, sizes, error) in enumerate(outcomes, start=1):
+        if error is None:
+            extractor.record_reparse(file_hash, sizes)
+            succeeded += 1
+        else:
+            logger.error(f"Failed to re-parse {file_hash}: {str(error)}")
+            failed_hashes[file_hash] = str(error)
+
+        if completed % progress_interval == 0:
+            logger.info(f"Progress: {completed}/{total_items} bill texts re-parsed")
+
+    logger.info(
+        f"Re-parse completed. "
+        f"Total Succeeded: {succeeded}, "
+        f"Total Failed: {len(failed_hashes)}, "
+        f"Not Attempted: {total_items - succeeded - len(failed_hashes)}"
+    )
+    if succeeded < total_items:
+        raise Exception(f"Re-parse left {total_items - succeeded} bill texts outdated")
+
+
 def run_pds_processing():
     """Run bidirectional ETL that syncs database -> PDS -> database"""
     directory = os.path.dirname(os.path.abspath(__file__))
@@ -211,15 +418,40 @@ def run_pds_processing():
         raise
 
 
-def orchestrate(stage: str = "all"):
+def run_view_refresh():
+    """Refresh the materialized views written to since their last refresh
+
+    Meant to run on a short schedule, so API writes reach the views without readers paying
+    for the refresh; views left clean since the last run cost one flag check each
+    """
+    referendum_db = next(get_referendum_db())
+    try:
+        for view in MaterializedView:
+            refresh_view_if_dirty(referendum_db, view)
+    finally:
+        referendum_db.close()
+
+
+def orchestrate(
+    stage: str = "all",
+    full: bool = False,
+    chunk_size: Optional[int] = ETL_CHUNK_SIZE,
+    max_workers: int = ETL_WORKERS,
+):
     """Orchestrate the complete ETL and text extraction process."""
     try:
         if stage in ["all", "etl"]:
             logger.info("ETL process starting")
-            run_etl()
+            run_etl(full=full, chunk_size=chunk_size, max_workers=max_workers)
         if stage in ["all", "text_processing"]:
             logger.info("Text extraction starting")
             run_text_extraction()
+        if stage == "reparse":
+            logger.info("Bill text re-parse starting")
+            run_reparse()
+        if stage == "refresh_views":
+            logger.info("Materialized view refresh starting")
+            run_view_refresh()
         if stage in ["all", "pds_processing"]:
             logger.info("PDS processing starting")
             run_pds_processing()
@@ -230,5 +462,40 @@ def orchestrate(stage: str = "all"):
 
 
 if __name__ == "__main__":
-    orchestrate("etl")
-    orchestrate("pds_processing")
+    parser = argparse.ArgumentParser(description="Run the Referendum data pipeline")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore stored high-water marks and re-extract every source row",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=ETL_CHUNK_SIZE,
+        help="Stream each source table through extract, transform and load in chunks of this size",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=ETL_WORKERS,
+        help="Number of independent ETL units to run concurrently",
+    )
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help="Only re-parse stored bill PDFs whose text came from an older parser version",
+    )
+    parser.add_argument(
+        "--refresh-views",
+        action="store_true",
+        help="Only refresh the materialized views that have changed since their last refresh",
+    )
+    args = parser.parse_args()
+
+    if args.reparse:
+        orchestrate("reparse")
+    elif args.refresh_views:
+        orchestrate("refresh_views")
+    else:
+        orchestrate("etl", full=args.full, chunk_size=args.chunk_size, max_workers=args.workers)
+        orchestrate("pds_processing")
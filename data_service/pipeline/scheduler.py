@@ -0,0 +1,130 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Set
+
+from common.database.referendum.models import Base
+from pipeline.etl_config import ETLConfig
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyCycleError(ValueError):
+    pass
+
+
+class SchedulerError(Exception):
+    def __init__(self, failures: Dict[str, Exception], skipped: Set[str]):
+        self.failures = failures
+        self.skipped = skipped
+        summary = ", ".join(f"{name}: {error}" for name, error in failures.items())
+        super().__init__(
+            f"{len(failures)} ETL unit(s) failed ({summary}); skipped {sorted(skipped)}"
+        )
+
+
+def infer_dependencies(etl_configs: List[ETLConfig]) -> Dict[str, Set[str]]:
+    """Map each destination to the destinations that must be loaded before it
+
+    Dependencies are inferred from the foreign keys of the columns each config writes, restricted
+    to destinations in the same run, plus anything declared in the config's `depends_on`
+    """
+    destinations = {config.destination for config in etl_configs}
+    dependencies = {}
+    for config in etl_configs:
+        unknown = set(config.depends_on) - destinations
+        if unknown:
+            raise ValueError(
+                f"'{config.destination}' depends on unknown destinations: {sorted(unknown)}"
+            )
+
+        upstream = set(config.depends_on)
+        table = Base.metadata.tables.get(config.destination)
+        if table is not None:
+            upstream.update(
+                fk.column.table.name
+                for fk in table.foreign_keys
+                if fk.parent.name in config.destination_columns
+            )
+        upstream.discard(config.destination)
+        dependencies[config.destination] = upstream & destinations
+
+    _check_acyclic(dependencies)
+    return dependencies
+
+
+def _check_acyclic(dependencies: Dict[str, Set[str]]):
+    remaining = {name: set(upstream) for name, upstream in dependencies.items()}
+    while remaining:
+        ready = [name for name, upstream in remaining.items() if not upstream]
+        if not ready:
+            raise DependencyCycleError(f"Dependency cycle between {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for upstream in remaining.values():
+            upstream.difference_update(ready)
+
+
+def run_dag(
+    etl_configs: List[ETLConfig],
+    unit: Callable[[ETLConfig], None],
+    max_workers: int = 4,
+):
+    """Run `unit` for every config, starting each one as soon as its dependencies have succeeded
+
+    Units without a path between them run concurrently, so wall-clock time is bounded by the
+    critical path rather than the sum of all units. When a unit fails, everything downstream of it
+    is skipped while independent branches run to completion, then a SchedulerError is raised.
+    """
+    dependencies = infer_dependencies(etl_configs)
+    configs = {config.destination: config for config in etl_configs}
+    # Submit ready units in config file order so runs are reproducible
+    order = {config.destination: index for index, config in enumerate(etl_configs)}
+
+    pending = {name: set(upstream) for name, upstream in dependencies.items()}
+    running: Dict[Future, str] = {}
+    failures: Dict[str, Exception] = {}
+    skipped: Set[str] = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="etl") as executor:
+        while pending or running:
+            ready = sorted((name for name, up in pending.items() if not up), key=order.get)
+            for name in ready:
+                del pending[name]
+                logger.info(f"Starting ETL unit '{name}'")
+                running[executor.submit(unit, configs[name])] = name
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    logger.info(f"Finished ETL unit '{name}'")
+                    for upstream in pending.values():
+                        upstream.discard(name)
+                    continue
+
+                logger.error(f"ETL unit '{name}' failed: {error}")
+                failures[name] = error
+                blocked = _downstream(name, pending)
+                for blocked_name in blocked:
+                    del pending[blocked_name]
+                skipped.update(blocked)
+
+    if failures:
+        raise SchedulerError(failures, skipped)
+
+
+def _downstream(name: str, pending: Dict[str, Set[str]]) -> Set[str]:
+    blocked = set()
+    frontier = {name}
+    while frontier:
+        frontier = {
+            candidate
+            for candidate, upstream in pending.items()
+            if candidate not in blocked and upstream & frontier
+        }
+        blocked.update(frontier)
+    return blocked
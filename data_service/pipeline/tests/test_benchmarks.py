@@ -0,0 +1,27 @@
+from pipeline.benchmarks import extraction, load
+from pipeline.etl_config import LoadMethod
+
+
+def test_load_benchmark_runs():
+    results = load.run_benchmark(rows=2000, repeat=1)
+
+    assert set(results) == {method.value for method in LoadMethod}
+    for timings in results.values():
+        assert len(timings["insert"]) == 1
+        assert len(timings["update"]) == 1
+
+
+def test_compare_skips_checksums_when_compress_differs():
+    bill = {"pages_per_second": 10, "checksums": {"json": "plain"}}
+    baseline = {"parser_version": 1, "compress": False, "bills": {"omnibus": bill}}
+    results = {
+        "parser_version": 1,
+        "compress": True,
+        "bills": {"omnibus": {**bill, "checksums": {"json": "gzipped"}}},
+    }
+
+    assert extraction.compare(results, baseline, tolerance=0.2) == []
+    results["compress"] = False
+    assert extraction.compare(results, baseline, tolerance=0.2) == [
+        "omnibus: output checksums changed"
+    ]
@@ -0,0 +1,44 @@
+import io
+import json
+import os
+
+import pytest
+
+from pipeline.bill_pdf_parser import BillPDFParser
+from pipeline.benchmarks.pdf_builder import bill_pages, write_pdf
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "bill.json")
+
+
+@pytest.fixture(scope="module")
+def bill_pdf():
+    return write_pdf(bill_pages(7))
+
+
+def parse(pdf_bytes, **kwargs):
+    return BillPDFParser(io.BytesIO(pdf_bytes), **kwargs).parse().model_dump(mode="json")
+
+
+def test_parse_matches_golden(bill_pdf):
+    parsed = parse(bill_pdf)
+
+    # Regenerate with UPDATE_GOLDEN=1 after an intentional change to the parser's output
+    if os.environ.get("UPDATE_GOLDEN"):
+        os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+        with open(GOLDEN_PATH, "w") as golden_file:
+            json.dump(parsed, golden_file, indent=2)
+            golden_file.write("\n")
+
+    with open(GOLDEN_PATH) as golden_file:
+        assert parsed == json.load(golden_file)
+
+
+def test_stream_parse_matches_serial(bill_pdf):
+    assert parse(bill_pdf, stream=True) == parse(bill_pdf)
+
+
+def test_parallel_parse_matches_serial(bill_pdf, monkeypatch):
+    # Ranges of two pages, so sections left open at a range boundary have to be stitched
+    monkeypatch.setattr(BillPDFParser, "PAGES_PER_RANGE", 2)
+
+    assert parse(bill_pdf, max_workers=2) == parse(bill_pdf)
@@ -0,0 +1,270 @@
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from pipeline import bill_text_extraction
+from pipeline.bill_text_extraction import (
+    BillTextExtractor,
+    TextSource,
+    TimeoutException,
+    _WorkerPool,
+    process_bills_in_pool,
+    reparse_in_pool,
+)
+from pipeline.pdf_downloader import DownloadedPDF, DownloadStatus
+
+
+class FakeDownloader:
+    """Hands out already-downloaded PDFs the way PDFDownloader.get does"""
+
+    def __init__(self, pdfs):
+        self.pdfs = list(pdfs)
+        self.exhausted = False
+
+    def get(self, timeout=None):
+        if not self.pdfs:
+            self.exhausted = True
+            return None
+        return self.pdfs.pop(0)
+
+
+# Stand-ins for the worker entry points. Pool workers are spawned, so these are pickled by
+# reference and have to be module level
+
+
+def _init_fake_worker(bucket_name, compress_text):
+    pass
+
+
+def _worker_pid():
+    return os.getpid()
+
+
+def _fake_process_pdf(url_hash, url, pdf, timeout_seconds):
+    action, _, marker = pdf.decode().partition(":")
+    if action == "crash" and not os.path.exists(marker):
+        # Only the first attempt crashes, so the retry on the fresh pool succeeds
+        open(marker, "w").close()
+        os._exit(1)
+    if action == "poison":
+        os._exit(1)
+    if action == "hang":
+        time.sleep(60)
+    time.sleep(0.5)
+    return {"json": len(pdf)}
+
+
+def _fake_reparse(file_hash, timeout_seconds):
+    if file_hash == "hang":
+        time.sleep(60)
+    time.sleep(0.5)
+    return {"json": len(file_hash)}
+
+
+@pytest.fixture
+def fake_workers(monkeypatch):
+    monkeypatch.setattr(bill_text_extraction, "_init_worker", _init_fake_worker)
+    monkeypatch.setattr(bill_text_extraction, "_process_pdf_in_worker", _fake_process_pdf)
+    monkeypatch.setattr(bill_text_extraction, "_reparse_in_worker", _fake_reparse)
+
+
+def make_pdfs(*contents):
+    return [
+        DownloadedPDF(url_hash=f"hash{i}", url=f"https://example.com/{i}.pdf", content=content)
+        for i, content in enumerate(contents)
+    ]
+
+
+def run_pool(pdfs, **kwargs):
+    outcomes = process_bills_in_pool(
+        FakeDownloader(pdfs), bucket_name="bills", max_workers=3, poll_seconds=0.1, **kwargs
+    )
+    return {pdf.url_hash: error for pdf, error in outcomes}
+
+
+def test_worker_crash_retries_in_flight_bills(fake_workers, tmp_path):
+    crash = f"crash:{tmp_path / 'crashed'}".encode()
+    pdfs = make_pdfs(b"ok", crash, b"ok", b"ok", b"ok")
+
+    errors = run_pool(pdfs)
+
+    # Bills that were in flight alongside the crash are retried rather than reported as failed
+    assert errors == {pdf.url_hash: None for pdf in pdfs}
+    assert all(pdf.output_sizes for pdf in pdfs)
+
+
+def test_repeated_worker_crash_is_reported(fake_workers):
+    pdfs = make_pdfs(b"poison")
+
+    errors = run_pool(pdfs, max_crash_retries=1)
+
+    assert isinstance(errors["hash0"], BrokenProcessPool)
+
+
+def test_hard_deadline_restarts_pool(fake_workers):
+    # A child of this process that isn't one of the pool's workers must survive the teardown
+    bystander = multiprocessing.get_context("spawn").Process(target=time.sleep, args=(30,))
+    bystander.start()
+    try:
+        pdfs = make_pdfs(b"ok", b"hang", b"ok", b"ok")
+
+        started = time.monotonic()
+        errors = run_pool(pdfs, timeout_seconds=5, grace_seconds=1)
+
+        assert time.monotonic() - started < 30
+        assert isinstance(errors.pop("hash1"), TimeoutException)
+        assert errors == {"hash0": None, "hash2": None, "hash3": None}
+        assert bystander.is_alive()
+    finally:
+        bystander.terminate()
+        bystander.join()
+
+
+def test_reparse_hard_deadline_restarts_pool(fake_workers):
+    started = time.monotonic()
+    outcomes = reparse_in_pool(
+        ["a", "hang", "bb", "ccc"],
+        bucket_name="bills",
+        max_workers=3,
+        timeout_seconds=5,
+        grace_seconds=1,
+        poll_seconds=0.1,
+    )
+    results = {file_hash: (sizes, error) for file_hash, sizes, error in outcomes}
+
+    assert time.monotonic() - started < 30
+    sizes, error = results.pop("hang")
+    assert sizes is None and isinstance(error, TimeoutException)
+    assert results == {
+        "a": ({"json": 1}, None),
+        "bb": ({"json": 2}, None),
+        "ccc": ({"json": 3}, None),
+    }
+
+
+def test_worker_pool_terminate_kills_only_its_workers():
+    bystander = multiprocessing.get_context("spawn").Process(target=time.sleep, args=(30,))
+    bystander.start()
+    try:
+        pool = _WorkerPool(
+            max_workers=2,
+            initializer=_init_fake_worker,
+            initargs=("bills", False),
+            max_tasks_per_child=5,
+        )
+        worker_pid = pool.submit(_worker_pid).result()
+        stuck = pool.submit(time.sleep, 60)
+        while not stuck.running():
+            time.sleep(0.1)
+        started = time.monotonic()
+
+        pool.terminate()
+
+        assert time.monotonic() - started < 30
+        assert isinstance(stuck.exception(), BrokenProcessPool)
+        assert worker_pid not in {child.pid for child in multiprocessing.active_children()}
+        assert bystander.is_alive()
+    finally:
+        bystander.terminate()
+        bystander.join()
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(BillTextExtractor, "SPOOL_THRESHOLD", 64)
+    monkeypatch.setattr(BillTextExtractor, "CHUNK_SIZE", 16)
+    extractor = BillTextExtractor(storage_client=Mock(), db_session=None, bucket_name="bills")
+    extractor.session = Mock()
+    return extractor
+
+
+def streamed_response(status_code=200, body=b""):
+    response = MagicMock(status_code=status_code, ok=status_code < 400, headers={})
+    response.iter_content.side_effect = lambda chunk_size: (
+        body[i : i + chunk_size] for i in range(0, len(body), chunk_size)
+    )
+    response.__enter__.return_value = response
+
+    def exit_response(*args):
+        response.close()
+        return False
+
+    response.__exit__.side_effect = exit_response
+    return response
+
+
+def test_fetch_pdf_not_modified_closes_response(extractor):
+    extractor.text_sources["hash0"] = TextSource(etag='"v1"', last_modified=None, content_hash="c")
+    response = streamed_response(status_code=304)
+    extractor.session.get.return_value = response
+
+    pdf = extractor.fetch_pdf("hash0", "https://example.com/0.pdf")
+
+    assert pdf.status == DownloadStatus.NOT_MODIFIED
+    response.close.assert_called_once()
+
+
+def test_fetch_pdf_keeps_small_pdfs_in_memory(extractor):
+    extractor.session.get.return_value = streamed_response(body=b"%PDF small")
+
+    pdf = extractor.fetch_pdf("hash0", "https://example.com/0.pdf")
+
+    assert pdf.content == b"%PDF small"
+    assert pdf.path is None
+    assert pdf.content_hash == hashlib.sha256(b"%PDF small").hexdigest()
+
+
+def test_fetch_pdf_spools_large_pdfs_until_released(extractor):
+    body = b"%PDF" + bytes(range(256)) * 2
+    extractor.session.get.return_value = streamed_response(body=body)
+
+    pdf = extractor.fetch_pdf("hash0", "https://example.com/0.pdf")
+
+    assert pdf.content is None
+    assert pdf.source == pdf.path
+    with open(pdf.path, "rb") as spooled:
+        assert spooled.read() == body
+    assert pdf.content_hash == hashlib.sha256(body).hexdigest()
+
+    path = pdf.path
+    pdf.release()
+    assert not os.path.exists(path)
+    assert pdf.source is None
+    # Releasing twice is harmless
+    pdf.release()
+
+
+def test_fetch_pdf_releases_unchanged_spool(extractor, tmp_path, monkeypatch):
+    monkeypatch.setattr(bill_text_extraction.tempfile, "tempdir", str(tmp_path))
+    body = b"%PDF" + bytes(range(256))
+    extractor.text_sources["hash0"] = TextSource(
+        etag=None, last_modified=None, content_hash=hashlib.sha256(body).hexdigest()
+    )
+    extractor.session.get.return_value = streamed_response(body=body)
+
+    pdf = extractor.fetch_pdf("hash0", "https://example.com/0.pdf")
+
+    assert pdf.status == DownloadStatus.UNCHANGED
+    assert pdf.path is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_read_body_removes_spool_when_download_fails(extractor, tmp_path, monkeypatch):
+    monkeypatch.setattr(bill_text_extraction.tempfile, "tempdir", str(tmp_path))
+
+    def broken_stream(chunk_size):
+        yield b"x" * 128
+        raise ConnectionError("connection reset")
+
+    response = streamed_response()
+    response.iter_content.side_effect = broken_stream
+
+    with pytest.raises(ConnectionError):
+        extractor._read_body(response)
+    assert list(tmp_path.iterdir()) == []
+    response.close.assert_called_once()
@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import defaultdict
+from unittest.mock import Mock
+from urllib.parse import urlparse
+
+from pipeline.pdf_downloader import DownloadedPDF, PDFDownloader
+
+
+def make_bills(host, count):
+    return [(f"{host}{i}", f"https://{host}/{i}.pdf") for i in range(count)]
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_interleave_by_host():
+    bills = make_bills("a.gov", 3) + make_bills("b.gov", 1) + make_bills("c.gov", 2)
+
+    ordered = PDFDownloader.interleave_by_host(bills)
+
+    hosts = [urlparse(url).netloc for _, url in ordered]
+    assert hosts == ["a.gov", "b.gov", "c.gov", "a.gov", "c.gov", "a.gov"]
+    # Each host's bills keep their relative order
+    assert [url_hash for url_hash, _ in ordered if url_hash.startswith("a")] == [
+        "a.gov0",
+        "a.gov1",
+        "a.gov2",
+    ]
+
+
+def test_per_host_limit():
+    lock = threading.Lock()
+    active = defaultdict(int)
+    peak = defaultdict(int)
+
+    def download(url_hash, url):
+        host = urlparse(url).netloc
+        with lock:
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+        time.sleep(0.05)
+        with lock:
+            active[host] -= 1
+        return DownloadedPDF(url_hash=url_hash, url=url, content=b"%PDF")
+
+    bills = make_bills("a.gov", 10) + make_bills("b.gov", 10)
+    downloader = PDFDownloader(download, max_workers=8, per_host_limit=2, queue_size=4)
+    downloader.start(bills)
+
+    assert sorted(pdf.url_hash for pdf in downloader) == sorted(url_hash for url_hash, _ in bills)
+    assert peak == {"a.gov": 2, "b.gov": 2}
+
+
+def test_slow_host_does_not_hold_workers():
+    slow_host_released = threading.Event()
+
+    def download(url_hash, url):
+        if url_hash.startswith("slow"):
+            slow_host_released.wait(timeout=10)
+        return DownloadedPDF(url_hash=url_hash, url=url, content=b"%PDF")
+
+    downloader = PDFDownloader(download, max_workers=2, per_host_limit=1)
+    downloader.start(make_bills("slow.gov", 3) + make_bills("fast.gov", 3))
+    try:
+        # The slow host's queued bills wait for its slot without occupying the second worker
+        fast = [downloader.get(timeout=5) for _ in range(3)]
+        assert [pdf.url_hash for pdf in fast] == ["fast.gov0", "fast.gov1", "fast.gov2"]
+    finally:
+        slow_host_released.set()
+    assert sorted(pdf.url_hash for pdf in downloader) == ["slow.gov0", "slow.gov1", "slow.gov2"]
+
+
+def test_full_queue_pauses_downloads():
+    downloaded = []
+
+    def download(url_hash, url):
+        downloaded.append(url_hash)
+        return DownloadedPDF(url_hash=url_hash, url=url, content=b"%PDF")
+
+    bills = make_bills("a.gov", 10) + make_bills("b.gov", 10)
+    downloader = PDFDownloader(download, max_workers=2, queue_size=3)
+    downloader.start(bills)
+
+    # Each worker holds one finished download while the queue is full
+    wait_until(lambda: len(downloaded) == 5)
+    time.sleep(0.2)
+    assert len(downloaded) == 5
+
+    assert len(list(downloader)) == len(bills)
+    assert len(downloaded) == len(bills)
+
+
+def test_downloader_stop_releases_queued_pdfs(tmp_path):
+    spooled = tmp_path / "spooled.pdf"
+    spooled.write_bytes(b"%PDF")
+    downloader = PDFDownloader(download=Mock())
+    downloader._put(
+        DownloadedPDF(url_hash="hash0", url="https://example.com/0.pdf", path=str(spooled))
+    )
+
+    downloader.stop()
+
+    assert not spooled.exists()
+    # Downloads finishing after the stop are released rather than queued
+    late = tmp_path / "late.pdf"
+    late.write_bytes(b"%PDF")
+    downloader._put(
+        DownloadedPDF(url_hash="hash1", url="https://example.com/1.pdf", path=str(late))
+    )
+    assert not late.exists()
+
+
+def test_stop_releases_spooled_downloads(tmp_path):
+    downloaded = []
+
+    def download(url_hash, url):
+        path = tmp_path / f"{url_hash}.pdf"
+        path.write_bytes(b"%PDF")
+        downloaded.append(url_hash)
+        return DownloadedPDF(url_hash=url_hash, url=url, path=str(path))
+
+    downloader = PDFDownloader(download, max_workers=2, queue_size=2)
+    downloader.start(make_bills("a.gov", 10))
+    wait_until(lambda: len(downloaded) == 4)
+
+    downloader.stop()
+
+    # Both the queued spools and the ones workers were waiting to queue are deleted, and no
+    # further bills are downloaded
+    wait_until(lambda: not list(tmp_path.iterdir()))
+    assert len(downloaded) == 4
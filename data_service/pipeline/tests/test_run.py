@@ -1,18 +1,20 @@
 import json
 import os
 
+import pytest
+import requests
 from pipeline import run
 from sqlalchemy import text
 from unittest.mock import Mock, patch
 
 from common.database.referendum import connection as referendum_connection
 from common.database.legiscan_api import connection as legiscan_api_connection
+from pipeline.bill_text_extraction import BillTextExtractor, TimeoutException
 from pipeline.etl_config import ETLConfig
+from pipeline.scheduler import SchedulerError
 
 
-def test_etl():
-    run.orchestrate(stage="etl")
-
+def assert_row_counts_match():
     referendum_db = referendum_connection.SessionLocal()
     legiscan_db = legiscan_api_connection.SessionLocal()
 
@@ -43,6 +45,166 @@ def test_etl():
     legiscan_db.close()
 
 
+def test_etl():
+    run.orchestrate(stage="etl")
+
+    assert_row_counts_match()
+
+
+def test_etl_refreshes_vote_counts_once():
+    run.orchestrate(stage="etl")
+
+    referendum_db = referendum_connection.SessionLocal()
+    dirty = referendum_db.execute(
+        text(
+            "SELECT dirty FROM materialized_view_refreshes WHERE view_name = 'vote_counts_by_party'"
+        )
+    ).scalar()
+    view_count, table_count = referendum_db.execute(
+        text(
+            "SELECT (SELECT SUM(vote_count) FROM vote_counts_by_party), "
+            "(SELECT COUNT(*) FROM legislator_votes)"
+        )
+    ).one()
+    referendum_db.close()
+
+    assert dirty is False
+    assert view_count == table_count
+
+
+def test_etl_refreshes_bill_catalog():
+    run.orchestrate(stage="etl")
+
+    referendum_db = referendum_connection.SessionLocal()
+    dirty = referendum_db.execute(
+        text("SELECT dirty FROM materialized_view_refreshes WHERE view_name = 'bill_catalog'")
+    ).scalar()
+    catalog_count, table_count = referendum_db.execute(
+        text("SELECT (SELECT COUNT(*) FROM bill_catalog), (SELECT COUNT(*) FROM bills)")
+    ).one()
+    referendum_db.close()
+
+    assert dirty is False
+    assert catalog_count == table_count
+
+
+def test_etl_failure_propagates():
+    failure = SchedulerError({"bills": RuntimeError("load failed")}, {"bill_votes"})
+
+    with patch.object(run, "run_dag", side_effect=failure):
+        with pytest.raises(SchedulerError):
+            run.orchestrate(stage="etl")
+
+
+def test_etl_streaming():
+    run.run_etl(full=True, chunk_size=50)
+
+    assert_row_counts_match()
+
+
+def test_etl_incremental():
+    run.orchestrate(stage="etl")
+
+    referendum_db = referendum_connection.SessionLocal()
+    legiscan_db = legiscan_api_connection.SessionLocal()
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    config_filepath = f"{directory}/../legiscan_etl_configs.json"
+    with open(config_filepath, "r") as config_file:
+        config_data = json.load(config_file)
+        etl_configs = [
+            ETLConfig(**config) for config in config_data if config.get("watermark_column")
+        ]
+
+    watermarks = run.get_watermarks()
+    with legiscan_db.connection() as conn:
+        for config in etl_configs:
+            assert config.destination in watermarks, f"No watermark saved for {config.destination}"
+
+            # Nothing changed in the source since the last run, so only the rows stamped exactly
+            # at the watermark are extracted again
+            since = watermarks[config.destination]
+            config.extract(conn, since=since)
+            at_watermark = conn.execute(
+                text(
+                    f"SELECT COUNT(*) FROM ({config._get_source_query(config.join_config)} "
+                    f"WHERE {config._get_watermark_expression()} = :since) AS at_watermark"
+                ),
+                {"since": since},
+            ).scalar()
+            assert (
+                len(config.dataframe) == at_watermark
+            ), f"Unchanged rows re-extracted for {config.destination}"
+
+            # A full extraction ignores the watermark
+            config.extract(conn)
+            referendum_count = referendum_db.execute(
+                text(f"SELECT COUNT(*) FROM {config.destination}")
+            ).scalar()
+            assert len(config.dataframe) == referendum_count
+
+    referendum_db.close()
+    legiscan_db.close()
+
+
+def test_etl_reload_skips_unchanged_rows():
+    run.orchestrate(stage="etl")
+
+    referendum_db = referendum_connection.SessionLocal()
+    legiscan_db = legiscan_api_connection.SessionLocal()
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    config_filepath = f"{directory}/../legiscan_etl_configs.json"
+    with open(config_filepath, "r") as config_file:
+        config_data = json.load(config_file)
+        etl_configs = [ETLConfig(**config) for config in config_data]
+
+    with legiscan_db.connection() as source_conn, referendum_db.connection() as conn:
+        for config in etl_configs:
+            config.extract(source_conn)
+            config.transform()
+            config.load(conn)
+
+            stats = config.load_stats
+            assert (
+                stats.inserted == 0 and stats.updated == 0
+            ), f"Unchanged rows rewritten for {config.destination}: {stats}"
+            assert stats.unchanged == len(config.dataframe)
+
+    referendum_db.close()
+    legiscan_db.close()
+
+
+def test_text_failures_back_off_then_dead_letter():
+    referendum_db = referendum_connection.SessionLocal()
+    extractor = BillTextExtractor(storage_client=None, db_session=referendum_db, bucket_name="")
+    url = "https://example.com/bills/missing.pdf"
+    not_found = requests.HTTPError(response=Mock(status_code=404))
+
+    try:
+        assert not extractor.record_failure("flaky", url, TimeoutException("Timed out"))
+        assert not extractor.record_failure("flaky", url, TimeoutException("Timed out"))
+        assert extractor.record_failure("gone", url, not_found)
+
+        rows = referendum_db.execute(
+            text(
+                "SELECT hash, error_class, attempts, dead_letter, "
+                "next_attempt_at - last_failed_at AS delay "
+                "FROM bill_text_failures ORDER BY hash"
+            )
+        ).all()
+        assert [(row.hash, row.error_class, row.attempts, row.dead_letter) for row in rows] == [
+            ("flaky", "TimeoutException", 2, False),
+            ("gone", "HTTPError", 1, True),
+        ]
+        assert rows[0].delay.total_seconds() == 2 * BillTextExtractor.RETRY_BASE_SECONDS
+        assert extractor.get_deferred_failure_counts() == {"backing_off": 1, "dead_letter": 1}
+    finally:
+        referendum_db.execute(text("DELETE FROM bill_text_failures"))
+        referendum_db.commit()
+        referendum_db.close()
+
+
 @patch("pipeline.etl_config.UserServiceClient")
 def test_pds(mock_user_service_client):
     # Mock the UserServiceClient
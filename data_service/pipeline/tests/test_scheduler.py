@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from pipeline.etl_config import ETLConfig
+from pipeline.scheduler import DependencyCycleError, SchedulerError, infer_dependencies, run_dag
+
+
+def load_legiscan_configs():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    with open(f"{directory}/../legiscan_etl_configs.json", "r") as config_file:
+        return [ETLConfig(**config) for config in json.load(config_file)]
+
+
+def make_config(destination, depends_on=None):
+    return ETLConfig(
+        source=f"ls_{destination}",
+        source_columns=set(),
+        destination=destination,
+        destination_columns=[],
+        transformations=[],
+        depends_on=depends_on or [],
+    )
+
+
+def test_infer_dependencies_from_foreign_keys():
+    dependencies = infer_dependencies(load_legiscan_configs())
+
+    for independent in ["states", "roles", "partys", "statuses", "vote_choices"]:
+        assert dependencies[independent] == set()
+    assert {"sessions", "legislative_bodys"} <= dependencies["bills"]
+    assert {"bill_actions", "legislators"} <= dependencies["legislator_votes"]
+    # bills.current_version_id is not written by the ETL, so there is no cycle with bill_versions
+    assert "bill_versions" not in dependencies["bills"]
+
+
+def test_declared_dependency_cycle():
+    configs = [make_config("a", depends_on=["b"]), make_config("b", depends_on=["a"])]
+
+    with pytest.raises(DependencyCycleError):
+        infer_dependencies(configs)
+
+
+def test_run_dag_respects_dependencies_and_runs_in_parallel():
+    configs = [
+        make_config("a"),
+        make_config("b"),
+        make_config("c", depends_on=["a", "b"]),
+    ]
+    finished = []
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def unit(config):
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+            finished.append(config.destination)
+
+    run_dag(configs, unit, max_workers=3)
+
+    assert finished[-1] == "c"
+    assert max_active == 2
+
+
+def test_run_dag_skips_downstream_of_failure():
+    configs = [
+        make_config("a"),
+        make_config("b", depends_on=["a"]),
+        make_config("c", depends_on=["b"]),
+        make_config("d"),
+    ]
+    finished = []
+
+    def unit(config):
+        if config.destination == "a":
+            raise RuntimeError("boom")
+        finished.append(config.destination)
+
+    with pytest.raises(SchedulerError) as exc_info:
+        run_dag(configs, unit, max_workers=2)
+
+    assert finished == ["d"]
+    assert set(exc_info.value.failures) == {"a"}
+    assert exc_info.value.skipped == {"b", "c"}